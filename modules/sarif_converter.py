@@ -329,16 +329,18 @@ def convert_reports_to_sarif(
     return True
 
 
-if __name__ == "__main__":
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; returns the process exit code."""
     import sys
-    if len(sys.argv) < 2:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 1:
         print("Usage: sarif_converter.py <output_path> [clang_tidy_path] [cppcheck_path] [iwyu_path]")
-        sys.exit(1)
+        return 1
 
-    output_path = Path(sys.argv[1])
-    clang_tidy_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
-    cppcheck_path = Path(sys.argv[3]) if len(sys.argv) > 3 else None
-    iwyu_path = Path(sys.argv[4]) if len(sys.argv) > 4 else None
+    output_path = Path(args[0])
+    clang_tidy_path = Path(args[1]) if len(args) > 1 else None
+    cppcheck_path = Path(args[2]) if len(args) > 2 else None
+    iwyu_path = Path(args[3]) if len(args) > 3 else None
 
     success = convert_reports_to_sarif(
         clang_tidy_path=clang_tidy_path,
@@ -347,4 +349,9 @@ if __name__ == "__main__":
         output_path=output_path
     )
 
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
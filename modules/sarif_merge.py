@@ -7,23 +7,47 @@ based on rule ID, file location, and message content.
 
 import json
 import hashlib
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Result hashes only need to be unique within one merge, so use the faster
+# non-cryptographic xxh3 when it is installed.
+try:  # pragma: no cover - import availability depends on environment
+    import xxhash  # type: ignore
+
+    XXHASH_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    xxhash = None  # type: ignore
+    XXHASH_AVAILABLE = False
+
+SARIF_SCHEMA = "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json"
+
+# SARIF severity ranks; the spec spells levels in lowercase, so the raw value
+# is tried first and only non-canonical spellings pay for a lower().
+_LEVEL_ORDER = {"error": 3, "warning": 2, "note": 1, "none": 0}
+
+# Shared read-only fallback for missing nested objects, so lookups like
+# ``(obj.get("key") or _EMPTY).get(...)`` don't allocate a dict per miss.
+_EMPTY: Dict[str, Any] = {}
+
+# Fields whose string values repeat heavily across results (rule IDs, levels,
+# artifact URIs), interned as the JSON is decoded.
+_INTERNED_FIELDS = ("ruleId", "level", "uri")
 
 
 def compute_result_hash(result: Dict[str, Any]) -> str:
     """Compute a hash for a SARIF result to enable deduplication."""
     # Extract key identifying information
     rule_id = result.get("ruleId", "")
-    message = result.get("message", {}).get("text", "")
+    message = (result.get("message") or _EMPTY).get("text", "")
 
     # Get primary location
-    locations = result.get("locations", [])
+    locations = result.get("locations")
     if locations:
-        loc = locations[0]
-        phys_loc = loc.get("physicalLocation", {})
-        artifact = phys_loc.get("artifactLocation", {}).get("uri", "")
-        region = phys_loc.get("region", {})
+        phys_loc = locations[0].get("physicalLocation") or _EMPTY
+        artifact = (phys_loc.get("artifactLocation") or _EMPTY).get("uri", "")
+        region = phys_loc.get("region") or _EMPTY
         line = region.get("startLine", 0)
         column = region.get("startColumn", 0)
     else:
@@ -33,6 +57,8 @@ def compute_result_hash(result: Dict[str, Any]) -> str:
 
     # Create hash from identifying information
     hash_input = f"{rule_id}:{artifact}:{line}:{column}:{message}"
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(hash_input.encode())
     return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
 
 
@@ -55,10 +81,9 @@ def merge_rules(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     merged_rules = {}
 
     for run in runs:
-        driver = run.get("tool", {}).get("driver", {})
-        rules = driver.get("rules", [])
+        driver = (run.get("tool") or _EMPTY).get("driver") or _EMPTY
 
-        for rule in rules:
+        for rule in driver.get("rules") or ():
             rule_id = rule.get("id")
             if rule_id and rule_id not in merged_rules:
                 merged_rules[rule_id] = rule
@@ -68,18 +93,15 @@ def merge_rules(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
 
 def merge_artifacts(runs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Merge and deduplicate artifacts from multiple runs."""
-    seen_uris: Set[str] = set()
-    merged_artifacts = []
+    merged_artifacts: Dict[str, Dict[str, Any]] = {}
 
     for run in runs:
-        artifacts = run.get("artifacts", [])
-        for artifact in artifacts:
-            uri = artifact.get("location", {}).get("uri", "")
-            if uri and uri not in seen_uris:
-                seen_uris.add(uri)
-                merged_artifacts.append(artifact)
+        for artifact in run.get("artifacts") or ():
+            uri = (artifact.get("location") or _EMPTY).get("uri")
+            if uri:
+                merged_artifacts.setdefault(uri, artifact)
 
-    return merged_artifacts
+    return list(merged_artifacts.values())
 
 
 def create_merged_run(runs: List[Dict[str, Any]], run_id: str = "merged") -> Dict[str, Any]:
@@ -89,11 +111,11 @@ def create_merged_run(runs: List[Dict[str, Any]], run_id: str = "merged") -> Dic
 
     # Collect all results
     all_results = []
-    tool_names = []
+    tool_names: Dict[str, None] = {}
 
     for run in runs:
-        tool_name = run.get("tool", {}).get("driver", {}).get("name", "unknown")
-        tool_names.append(tool_name)
+        driver = (run.get("tool") or _EMPTY).get("driver") or _EMPTY
+        tool_names[driver.get("name", "unknown")] = None
         all_results.extend(run.get("results", []))
 
     # Deduplicate results
@@ -111,7 +133,7 @@ def create_merged_run(runs: List[Dict[str, Any]], run_id: str = "merged") -> Dic
                 "version": "1.0.0",
                 "informationUri": "https://github.com/gregvw/llm-cpp-toolkit",
                 "shortDescription": {"text": "LLM C++ Toolkit merged analysis"},
-                "fullDescription": {"text": f"Combined analysis from: {', '.join(set(tool_names))}"},
+                "fullDescription": {"text": f"Combined analysis from: {', '.join(tool_names)}"},
                 "rules": list(merged_rules.values())
             }
         },
@@ -131,26 +153,42 @@ def create_merged_run(runs: List[Dict[str, Any]], run_id: str = "merged") -> Dic
     return merged_run
 
 
+def _intern_fields(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """json object_hook interning the repeated string fields of each object."""
+    for key in _INTERNED_FIELDS:
+        value = obj.get(key)
+        if value.__class__ is str:
+            obj[key] = sys.intern(value)
+    return obj
+
+
+def _load_sarif_runs(file_path: Path) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Parse one SARIF file, returning its runs and a warning if it was skipped."""
+    if not file_path.exists():
+        return [], f"Warning: SARIF file not found: {file_path}"
+
+    try:
+        with open(file_path) as f:
+            sarif_doc = json.load(f, object_hook=_intern_fields)
+    except (json.JSONDecodeError, IOError) as e:
+        return [], f"Warning: Failed to read SARIF file {file_path}: {e}"
+
+    # Extract runs from the document
+    return sarif_doc.get("runs", []), None
+
+
 def merge_sarif_files(*file_paths: Path, output_path: Path = None) -> Dict[str, Any]:
     """Merge multiple SARIF files into a single document."""
     runs = []
 
+    # Parsed in-process: shipping each parsed run back from a worker costs
+    # about as much as parsing it here.
     for file_path in file_paths:
-        if not file_path.exists():
-            print(f"Warning: SARIF file not found: {file_path}")
-            continue
-
-        try:
-            with open(file_path) as f:
-                sarif_doc = json.load(f)
-
-            # Extract runs from the document
-            doc_runs = sarif_doc.get("runs", [])
-            runs.extend(doc_runs)
-
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Failed to read SARIF file {file_path}: {e}")
+        doc_runs, warning = _load_sarif_runs(file_path)
+        if warning:
+            print(warning)
             continue
+        runs.extend(doc_runs)
 
     if not runs:
         print("No valid SARIF files found to merge")
@@ -161,7 +199,7 @@ def merge_sarif_files(*file_paths: Path, output_path: Path = None) -> Dict[str,
 
     merged_doc = {
         "version": "2.1.0",
-        "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
+        "$schema": SARIF_SCHEMA,
         "runs": [merged_run]
     }
 
@@ -187,24 +225,26 @@ def get_sarif_statistics(sarif_doc: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     for run in sarif_doc.get("runs", []):
-        tool_name = run.get("tool", {}).get("driver", {}).get("name", "unknown")
+        driver = (run.get("tool") or _EMPTY).get("driver") or _EMPTY
+        tool_name = driver.get("name", "unknown")
         results = run.get("results", [])
-        rules = run.get("tool", {}).get("driver", {}).get("rules", [])
 
         stats["total_results"] += len(results)
         stats["results_by_tool"][tool_name] = len(results)
-        stats["rule_count"] += len(rules)
+        stats["rule_count"] += len(driver.get("rules", []))
 
+        results_by_level = stats["results_by_level"]
+        unique_files = stats["unique_files"]
         for result in results:
             level = result.get("level", "unknown")
-            stats["results_by_level"][level] = stats["results_by_level"].get(level, 0) + 1
+            results_by_level[level] = results_by_level.get(level, 0) + 1
 
             # Track unique files
-            for location in result.get("locations", []):
-                phys_loc = location.get("physicalLocation", {})
-                uri = phys_loc.get("artifactLocation", {}).get("uri", "")
+            for location in result.get("locations") or ():
+                phys_loc = location.get("physicalLocation") or _EMPTY
+                uri = (phys_loc.get("artifactLocation") or _EMPTY).get("uri")
                 if uri:
-                    stats["unique_files"].add(uri)
+                    unique_files.add(uri)
 
     stats["unique_files"] = len(stats["unique_files"])
     return stats
@@ -212,8 +252,8 @@ def get_sarif_statistics(sarif_doc: Dict[str, Any]) -> Dict[str, Any]:
 
 def filter_sarif_by_severity(sarif_doc: Dict[str, Any], min_level: str = "warning") -> Dict[str, Any]:
     """Filter SARIF document to only include results at or above specified severity level."""
-    level_order = {"error": 3, "warning": 2, "note": 1, "none": 0}
-    min_level_value = level_order.get(min_level.lower(), 2)
+    level_rank = _LEVEL_ORDER.get
+    min_level_value = level_rank(min_level.lower(), 2)
 
     filtered_doc = {
         "version": sarif_doc.get("version", "2.1.0"),
@@ -226,7 +266,9 @@ def filter_sarif_by_severity(sarif_doc: Dict[str, Any], min_level: str = "warnin
 
         for result in run.get("results", []):
             result_level = result.get("level", "warning")
-            result_level_value = level_order.get(result_level.lower(), 2)
+            result_level_value = level_rank(result_level)
+            if result_level_value is None:
+                result_level_value = level_rank(result_level.lower(), 2)
 
             if result_level_value >= min_level_value:
                 filtered_results.append(result)
@@ -239,21 +281,21 @@ def filter_sarif_by_severity(sarif_doc: Dict[str, Any], min_level: str = "warnin
     return filtered_doc
 
 
-if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 3:
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; returns the process exit code."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 2:
         print("Usage: sarif_merge.py <output_path> <sarif_file1> [sarif_file2] ...")
         print("       sarif_merge.py --stats <sarif_file>")
         print("       sarif_merge.py --filter <min_level> <input_file> <output_file>")
-        sys.exit(1)
+        return 1
 
-    if sys.argv[1] == "--stats":
+    if args[0] == "--stats":
         # Show statistics for a SARIF file
-        sarif_file = Path(sys.argv[2])
+        sarif_file = Path(args[1])
         if not sarif_file.exists():
             print(f"Error: File not found: {sarif_file}")
-            sys.exit(1)
+            return 1
 
         with open(sarif_file) as f:
             sarif_doc = json.load(f)
@@ -261,19 +303,19 @@ if __name__ == "__main__":
         stats = get_sarif_statistics(sarif_doc)
         print(json.dumps(stats, indent=2))
 
-    elif sys.argv[1] == "--filter":
+    elif args[0] == "--filter":
         # Filter SARIF file by severity level
-        if len(sys.argv) < 5:
+        if len(args) < 4:
             print("Usage: sarif_merge.py --filter <min_level> <input_file> <output_file>")
-            sys.exit(1)
+            return 1
 
-        min_level = sys.argv[2]
-        input_file = Path(sys.argv[3])
-        output_file = Path(sys.argv[4])
+        min_level = args[1]
+        input_file = Path(args[2])
+        output_file = Path(args[3])
 
         if not input_file.exists():
             print(f"Error: Input file not found: {input_file}")
-            sys.exit(1)
+            return 1
 
         with open(input_file) as f:
             sarif_doc = json.load(f)
@@ -287,11 +329,21 @@ if __name__ == "__main__":
 
     else:
         # Merge SARIF files
-        output_path = Path(sys.argv[1])
-        input_files = [Path(p) for p in sys.argv[2:]]
+        output_path = Path(args[0])
+        input_files = [Path(p) for p in args[1:]]
 
         merged_doc = merge_sarif_files(*input_files, output_path=output_path)
 
         if merged_doc:
-            stats = get_sarif_statistics(merged_doc)
-            print(f"Merge completed: {stats['total_results']} results from {stats['total_runs']} runs")
\ No newline at end of file
+            # Both counts are known from the merged run; no need for a full
+            # get_sarif_statistics traversal.
+            merged_run = merged_doc["runs"][0]
+            total_results = len(merged_run.get("results", []))
+            total_runs = len(merged_doc["runs"])
+            print(f"Merge completed: {total_results} results from {total_runs} runs")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
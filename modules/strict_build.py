@@ -9,10 +9,12 @@ from __future__ import annotations
 
 import argparse
 import datetime as _dt
+import functools
 import json
 import os
 import pathlib
 import re
+import select
 import shlex
 import shutil
 import subprocess
@@ -21,6 +23,15 @@ import time
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+# Hyperscan scans the whole pattern set in one SIMD pass; fall back to re.
+try:  # pragma: no cover - import availability depends on environment
+    import hyperscan  # type: ignore
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    hyperscan = None  # type: ignore
+    HYPERSCAN_AVAILABLE = False
+
 STRICT_WARNING_FLAGS = ["-Wall", "-Wextra", "-Wconversion", "-Wshadow", "-Werror"]
 SANITIZER_FLAGS = ["-fsanitize=address", "-fsanitize=undefined"]
 DEFAULT_STD = "23"
@@ -31,13 +42,41 @@ DEFAULT_TIDY_CHECKS = (
     "bugprone-*,performance-*,modernize-*,readability-*,clang-analyzer-*"
 )
 IMPORTANT_LINE_PATTERNS = [
-    re.compile(pat, re.IGNORECASE)
-    for pat in [
-        r"error", r"warning", r"FAILED", r"(?:100|[1-9]?\d)% tests",
-        r"The following tests FAILED", r"ninja:\s*(?:error|warning)",
-        r"^-- (?:Configuring|Generating|Build|Installing)",
-    ]
+    r"error", r"warning", r"FAILED", r"(?:100|[1-9]?\d)% tests",
+    r"The following tests FAILED", r"ninja:\s*(?:error|warning)",
+    r"^-- (?:Configuring|Generating|Build|Installing)",
 ]
+# Single alternation over raw output blocks so each line is scanned once
+# rather than once per pattern.
+IMPORTANT_LINE_RE = re.compile(
+    "|".join(f"(?:{pat})" for pat in IMPORTANT_LINE_PATTERNS).encode(),
+    re.IGNORECASE | re.MULTILINE,
+)
+# Stage output is read from the pipe in blocks of this size.
+READ_CHUNK_SIZE = 1 << 16
+# Highlights are echoed to the terminal in batches of up to this many lines,
+# or once this many seconds have passed since the last echo.
+ECHO_BATCH_LINES = 16
+ECHO_FLUSH_INTERVAL = 0.05
+
+
+def _compile_hyperscan_db():
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pat.encode() for pat in IMPORTANT_LINE_PATTERNS],
+            ids=list(range(len(IMPORTANT_LINE_PATTERNS))),
+            flags=[flags] * len(IMPORTANT_LINE_PATTERNS),
+        )
+    except Exception:  # pragma: no cover - fall back to the re path
+        return None
+    return db
+
+
+_HYPERSCAN_DB = _compile_hyperscan_db()
 
 
 @dataclass
@@ -51,7 +90,10 @@ class StageResult:
     log_path: pathlib.Path
     filtered_lines: List[str] = field(default_factory=list)
 
-    def summary(self) -> Dict[str, object]:
+    @functools.cached_property
+    def summary_dict(self) -> Dict[str, object]:
+        """Summary built once per stage; results are not modified after _run."""
+
         return {
             "name": self.name,
             "command": self.command,
@@ -61,6 +103,9 @@ class StageResult:
             "highlights": self.filtered_lines,
         }
 
+    def summary(self) -> Dict[str, object]:
+        return self.summary_dict
+
 
 def _now_stamp() -> str:
     return _dt.datetime.now(_dt.UTC).strftime("%Y%m%d_%H%M%S")
@@ -71,19 +116,71 @@ def _ensure_dir(path: pathlib.Path) -> pathlib.Path:
     return path
 
 
+def _important_line_starts(block: bytes) -> List[int]:
+    """Return start offsets of the lines in ``block`` with an important match."""
+
+    if _HYPERSCAN_DB is not None:
+        starts = set()
+
+        def on_match(_id, _from, to, _flags, _context=None):
+            starts.add(block.rfind(b"\n", 0, to) + 1)
+
+        _HYPERSCAN_DB.scan(block, match_event_handler=on_match)
+        return sorted(starts)
+
+    starts_list: List[int] = []
+    search = IMPORTANT_LINE_RE.search
+    pos = 0
+    while True:
+        match = search(block, pos)
+        if match is None:
+            break
+        starts_list.append(block.rfind(b"\n", 0, match.end()) + 1)
+        # Skip the rest of the matched line; one hit is enough to keep it.
+        pos = block.find(b"\n", match.end()) + 1
+        if pos == 0:
+            break
+    return starts_list
+
+
+def _important_lines(block: bytes) -> List[str]:
+    """Return the decoded lines of ``block`` matching IMPORTANT_LINE_PATTERNS."""
+
+    lines: List[str] = []
+    for start in _important_line_starts(block):
+        end = block.find(b"\n", start)
+        if end < 0:
+            end = len(block)
+        lines.append(block[start:end].decode("utf-8", errors="replace").rstrip())
+    return lines
+
+
 def _filter_lines(stream: Iterable[str]) -> List[str]:
-    highlights: List[str] = []
-    for line in stream:
-        text = line.rstrip()
-        if not text:
-            continue
-        if any(pat.search(text) for pat in IMPORTANT_LINE_PATTERNS):
-            highlights.append(text)
-    return highlights
+    texts = [text for text in (line.rstrip() for line in stream) if text]
+    return _important_lines("\n".join(texts).encode("utf-8", errors="replace"))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_path(path: str, cwd: str) -> pathlib.Path:
+    return (pathlib.Path(cwd) / path).resolve()
 
 
 def _normalize_path(path: pathlib.Path | str) -> pathlib.Path:
-    return pathlib.Path(path).resolve()
+    # Relative paths resolve against the cwd, so it is part of the cache key.
+    path = os.fspath(path)
+    return _resolve_path(path, "" if os.path.isabs(path) else os.getcwd())
+
+
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    return shutil.which(name)
 
 
 def _quote_list(items: Sequence[str]) -> List[str]:
@@ -132,12 +229,12 @@ def strict_configure_command(
     cmd.append(f"-DCMAKE_EXE_LINKER_FLAGS={joined_sanitizers}")
     cmd.append(f"-DCMAKE_SHARED_LINKER_FLAGS={joined_sanitizers}")
 
-    if use_ccache and shutil.which("ccache"):
+    if use_ccache and _which("ccache"):
         cmd.append("-DCMAKE_CXX_COMPILER_LAUNCHER=ccache")
         cmd.append("-DCMAKE_C_COMPILER_LAUNCHER=ccache")
 
     if enable_tidy:
-        tidy = shutil.which("clang-tidy") or "clang-tidy"
+        tidy = _which("clang-tidy") or "clang-tidy"
         tidy_value = f"{tidy};-checks={tidy_checks};-warnings-as-errors=*"
         cmd.append(f"-DCMAKE_CXX_CLANG_TIDY={tidy_value}")
 
@@ -223,24 +320,56 @@ class StrictBuildManager:
         log_path = self.log_dir / f"{stage}_{_now_stamp()}.log"
         highlights: List[str] = []
         start = time.perf_counter()
-        with open(log_path, "w", encoding="utf-8", errors="replace") as log:
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
             proc = subprocess.Popen(
                 command,
                 cwd=self.source_dir,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
+                bufsize=READ_CHUNK_SIZE,
             )
             assert proc.stdout is not None
-            for line in proc.stdout:
-                log.write(line)
-                if any(pat.search(line) for pat in IMPORTANT_LINE_PATTERNS):
-                    highlights.append(line.rstrip())
-                    sys.stdout.write(line)
-                    sys.stdout.flush()
+            fd = proc.stdout.fileno()
+            partial = b""
+            pending: List[str] = []
+            last_echo = time.monotonic()
+
+            def echo_pending() -> None:
+                nonlocal last_echo
+                sys.stdout.write("".join(pending))
+                sys.stdout.flush()
+                pending.clear()
+                last_echo = time.monotonic()
+
+            while True:
+                # Don't let buffered highlights sit behind a quiet child.
+                if pending and not select.select([fd], [], [], ECHO_FLUSH_INTERVAL)[0]:
+                    echo_pending()
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                _write_all(log_fd, chunk)
+                # Only complete lines are scanned; the tail waits for more data.
+                block, _, partial = (partial + chunk).rpartition(b"\n")
+                for text in _important_lines(block):
+                    highlights.append(text)
+                    pending.append(text + "\n")
+                if pending and (
+                    len(pending) >= ECHO_BATCH_LINES
+                    or time.monotonic() - last_echo >= ECHO_FLUSH_INTERVAL
+                ):
+                    echo_pending()
+            for text in _important_lines(partial):
+                highlights.append(text)
+                pending.append(text + "\n")
+            if pending:
+                echo_pending()
+            proc.stdout.close()
             proc.wait()
             returncode = proc.returncode or 0
+        finally:
+            os.close(log_fd)
         duration = time.perf_counter() - start
         if returncode != 0:
             print(f"❌ {stage} failed (logs: {log_path})")
@@ -282,7 +411,7 @@ class StrictBuildManager:
 def _write_summary(path: pathlib.Path, stages: Sequence[StageResult]) -> None:
     data = {
         "generated_at": _dt.datetime.now(_dt.UTC).isoformat(),
-        "stages": [stage.summary() for stage in stages],
+        "stages": [stage.summary_dict for stage in stages],
     }
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data, indent=2))
@@ -4,14 +4,34 @@ Template Engine for LLM C++ Toolkit
 Handles template loading, inheritance, and configuration resolution.
 """
 
-import yaml
+import itertools
+import marshal
+import os
 import pathlib
-from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass, field
-import copy
+import sys
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Iterable, List, Optional, Tuple, Union
+from dataclasses import asdict, dataclass, field
 
+# PyYAML is imported on first parse, so importing this module stays cheap
+yaml = None
+_SafeLoader = None
 
-@dataclass
+# The YAML-derived template fields are marshalled here and reused while the
+# YAML files are unchanged; bump TEMPLATE_CACHE_VERSION whenever TemplateConfig
+# or the way templates are read changes shape.
+TEMPLATE_CACHE_VERSION = "2"
+TEMPLATE_CACHE_FILE = pathlib.Path(os.environ.get(
+    "LLMTK_TEMPLATE_CACHE", pathlib.Path.home() / ".cache" / "llm-cpp-toolkit" / "templates.marshal"))
+# Resolved templates kept per engine, least recently used evicted first
+RESOLVE_CACHE_SIZE = 128
+
+
+# Slotted dataclasses need Python 3.10; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TemplateConfig:
     """Configuration for a template"""
     name: str
@@ -32,6 +52,132 @@ class TemplateConfig:
     documentation: Optional[str] = None
 
 
+@dataclass
+class _ToggleEffects:
+    """A toggle definition normalized so applying it needs no type checks.
+
+    Effects keyed by value become maps from value to items and are looked up
+    with the toggle value; unconditional effects keep their full list and are
+    applied whatever the value, which may then be unhashable.
+    """
+    valid_values: List[Any]
+    compiler_flags: Dict[Any, List[str]]
+    default_compiler_flags: List[str]
+    compiler_flags_keyed: bool
+    dependencies: Dict[Any, List[str]]
+    default_dependencies: List[str]
+    dependencies_keyed: bool
+    cmake_flag: Optional[str]
+
+    @staticmethod
+    def _split(effect: Any) -> Tuple[Dict[Any, List[str]], List[str], bool]:
+        if isinstance(effect, dict):
+            return effect, [], True
+        return {}, list(effect or []), False
+
+    @classmethod
+    def from_config(cls, toggle_config: Dict[str, Any]) -> "_ToggleEffects":
+        compiler_flags, default_compiler_flags, compiler_flags_keyed = cls._split(toggle_config.get('compiler_flags'))
+        dependencies, default_dependencies, dependencies_keyed = cls._split(toggle_config.get('dependencies'))
+        return cls(
+            valid_values=toggle_config.get('values', []),
+            compiler_flags=compiler_flags,
+            default_compiler_flags=default_compiler_flags,
+            compiler_flags_keyed=compiler_flags_keyed,
+            dependencies=dependencies,
+            default_dependencies=default_dependencies,
+            dependencies_keyed=dependencies_keyed,
+            cmake_flag=toggle_config.get('cmake_flag'),
+        )
+
+    def compiler_flags_for(self, value: Any) -> List[str]:
+        if self.compiler_flags_keyed:
+            return self.compiler_flags.get(value, self.default_compiler_flags)
+        return self.default_compiler_flags
+
+    def dependencies_for(self, value: Any) -> List[str]:
+        if self.dependencies_keyed:
+            return self.dependencies.get(value, self.default_dependencies)
+        return self.default_dependencies
+
+
+def _copy_plain(value: Any) -> Any:
+    """Copy nested YAML dicts and lists; scalars are immutable and shared."""
+    if isinstance(value, dict):
+        return {key: _copy_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_plain(item) for item in value]
+    return value
+
+
+def _clone_template(template: TemplateConfig) -> TemplateConfig:
+    """Copy a template's containers so merges never mutate the loaded original.
+
+    TemplateConfig only holds plain YAML data without cycles, so copying the
+    containers directly is much cheaper than copy.deepcopy. Settings and
+    overrides may nest arbitrarily and are copied all the way down; the other
+    fields hold lists of strings and need only one level.
+    """
+    return TemplateConfig(
+        name=template.name,
+        description=template.description,
+        type=template.type,
+        inherits=template.inherits,
+        settings=_copy_plain(template.settings),
+        overrides=_copy_plain(template.overrides),
+        compiler_flags=list(template.compiler_flags),
+        linker_flags=list(template.linker_flags),
+        cmake_options=list(template.cmake_options),
+        cmake_template=template.cmake_template,
+        cmake_template_additions=template.cmake_template_additions,
+        files=[dict(entry) for entry in template.files],
+        libraries={key: list(value) for key, value in template.libraries.items()},
+        dependencies=list(template.dependencies),
+        clang_tidy_checks={key: list(value) for key, value in template.clang_tidy_checks.items()},
+        documentation=template.documentation
+    )
+
+
+def _safe_load(stream) -> Any:
+    """Parse YAML with the fastest available safe loader, importing PyYAML lazily"""
+    global yaml, _SafeLoader
+    if yaml is None:
+        import yaml as yaml_module
+        # Prefer the libyaml-backed C loader; it parses the same safe subset.
+        _SafeLoader = getattr(yaml_module, "CSafeLoader", yaml_module.SafeLoader)
+        yaml = yaml_module
+    return yaml.load(stream, Loader=_SafeLoader)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Build a hashable cache key for a user override value.
+
+    Dicts keep their insertion order, since overrides are applied in that
+    order and it decides the order of the resulting flags.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    # Keep the type so that True and 1 do not share a cache entry
+    return (type(value), value)
+
+
+def _merge_list_maps(maps: Iterable[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """Concatenate the lists of each key across maps, keeping first-seen key order."""
+    merged: Dict[str, List[str]] = {}
+    for mapping in maps:
+        for key, values in mapping.items():
+            merged.setdefault(key, []).extend(values)
+    return merged
+
+
+def _last_set(values: Iterable[Any]) -> Any:
+    """Return the last truthy value, or the first value if none are set."""
+    values = list(values)
+    return next((value for value in reversed(values) if value), values[0])
+
+
 class TemplateEngine:
     """Engine for loading and resolving template configurations"""
 
@@ -40,6 +186,11 @@ class TemplateEngine:
         self.manifest_dir = manifest_dir
         self.templates: Dict[str, TemplateConfig] = {}
         self.toggles: Dict[str, Dict[str, Any]] = {}
+        self._toggle_effects: Dict[str, _ToggleEffects] = {}
+        self._resolve_cache: "OrderedDict[Tuple[str, Hashable], TemplateConfig]" = OrderedDict()
+        self._chains: Dict[str, List[str]] = {}
+        # Legacy presets never change, so build them once and clone per resolve
+        self._legacy_templates = {name: self._build_legacy_template(name) for name in ("minimal", "full", "library")}
         self._load_templates()
         self._load_toggles()
 
@@ -51,16 +202,74 @@ class TemplateEngine:
             self.template_dir / "domain"
         ]
 
-        for template_path in template_paths:
-            if template_path.exists():
-                for yaml_file in template_path.glob("*.yaml"):
-                    self._load_template_file(yaml_file)
+        yaml_files = [
+            yaml_file
+            for template_path in template_paths if template_path.exists()
+            for yaml_file in template_path.glob("*.yaml")
+        ]
 
-    def _load_template_file(self, yaml_file: pathlib.Path):
-        """Load a single template file"""
+        signature = self._template_signature(yaml_files)
+        cached = self._read_template_cache(signature)
+        if cached is not None:
+            self.templates = cached
+        else:
+            loaded = [self._load_template_file(yaml_file) for yaml_file in yaml_files]
+            # Don't cache a partial load, so broken files keep warning until fixed
+            if signature is not None and all(loaded):
+                self._write_template_cache(signature)
+
+        # Templates are static once loaded, so every chain can be built up front.
+        # Broken chains are left out and raise when they are resolved.
+        for name in self.templates:
+            try:
+                self._chains[name] = self._compute_inheritance_chain(name)
+            except ValueError:
+                pass
+
+    @staticmethod
+    def _template_signature(yaml_files: List[pathlib.Path]) -> Optional[Tuple]:
+        """Identify the cache format and current template files by path, mtime and size"""
+        try:
+            stats = [(str(path.resolve()), path.stat()) for path in yaml_files]
+        except OSError:
+            return None
+        files = tuple(sorted((path, st.st_mtime_ns, st.st_size) for path, st in stats))
+        return (TEMPLATE_CACHE_VERSION, files)
+
+    def _read_template_cache(self, signature: Optional[Tuple]) -> Optional[Dict[str, TemplateConfig]]:
+        """Return cached templates if they were parsed from the same files"""
+        if signature is None:
+            return None
+        try:
+            with open(TEMPLATE_CACHE_FILE, 'rb') as f:
+                cached_signature, fields = marshal.load(f)
+            if cached_signature != signature:
+                return None
+            return {name: TemplateConfig(**values) for name, values in fields.items()}
+        except Exception:
+            return None
+
+    def _write_template_cache(self, signature: Tuple):
+        """Store parsed templates for later runs; failures only cost speed"""
+        tmp_file = TEMPLATE_CACHE_FILE.with_name(f"{TEMPLATE_CACHE_FILE.name}.{os.getpid()}.tmp")
+        try:
+            TEMPLATE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fields = {name: asdict(template) for name, template in self.templates.items()}
+            with open(tmp_file, 'wb') as f:
+                # Raises ValueError for YAML values marshal can't store, such as dates
+                marshal.dump((signature, fields), f)
+            os.replace(tmp_file, TEMPLATE_CACHE_FILE)
+        except (OSError, ValueError):
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+
+    def _load_template_file(self, yaml_file: pathlib.Path) -> bool:
+        """Load a single template file, returning whether it succeeded"""
         try:
             with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
+                data = _safe_load(f)
 
             template = TemplateConfig(
                 name=data.get('name', yaml_file.stem),
@@ -82,9 +291,11 @@ class TemplateEngine:
             )
 
             self.templates[template.name] = template
+            return True
 
         except Exception as e:
             print(f"Warning: Failed to load template {yaml_file}: {e}")
+            return False
 
     def _load_toggles(self):
         """Load toggle definitions from templates.yaml manifest"""
@@ -92,8 +303,13 @@ class TemplateEngine:
         if templates_manifest.exists():
             try:
                 with open(templates_manifest, 'r') as f:
-                    data = yaml.safe_load(f)
-                self.toggles = data.get('toggles', {})
+                    data = _safe_load(f)
+                toggles = data.get('toggles', {})
+                toggle_effects = {
+                    name: _ToggleEffects.from_config(config) for name, config in toggles.items()
+                }
+                # Assign together so a malformed toggle can't leave them out of step
+                self.toggles, self._toggle_effects = toggles, toggle_effects
             except Exception as e:
                 print(f"Warning: Failed to load toggles from {templates_manifest}: {e}")
 
@@ -108,6 +324,25 @@ class TemplateEngine:
         """Resolve a template with inheritance and user overrides"""
         user_overrides = user_overrides or {}
 
+        try:
+            cache_key = (preset_name, _freeze(user_overrides))
+            hash(cache_key)
+        except TypeError:
+            cache_key = None
+        if cache_key is not None and cache_key in self._resolve_cache:
+            self._resolve_cache.move_to_end(cache_key)
+            return _clone_template(self._resolve_cache[cache_key])
+
+        resolved = self._resolve_uncached(preset_name, user_overrides)
+        if cache_key is not None:
+            # Callers may mutate what they get back, so the cache keeps its own copy
+            self._resolve_cache[cache_key] = _clone_template(resolved)
+            if len(self._resolve_cache) > RESOLVE_CACHE_SIZE:
+                self._resolve_cache.popitem(last=False)
+        return resolved
+
+    def _resolve_uncached(self, preset_name: str, user_overrides: Dict[str, Any]) -> TemplateConfig:
+        """Resolve a template without consulting the resolution cache"""
         # Handle legacy presets
         if preset_name in ["minimal", "full", "library"]:
             return self._create_legacy_template(preset_name, user_overrides)
@@ -128,6 +363,13 @@ class TemplateEngine:
 
     def _build_inheritance_chain(self, preset_name: str) -> List[str]:
         """Build the inheritance chain for a preset"""
+        chain = self._chains.get(preset_name)
+        if chain is None:
+            chain = self._compute_inheritance_chain(preset_name)
+        return chain
+
+    def _compute_inheritance_chain(self, preset_name: str) -> List[str]:
+        """Walk inherits links from a preset down to its base template"""
         chain = []
         current = preset_name
 
@@ -155,63 +397,45 @@ class TemplateEngine:
         # Start with base template
         base_name = inheritance_chain[0]
         if base_name in self.templates:
-            result = copy.deepcopy(self.templates[base_name])
+            base = self.templates[base_name]
         else:
             # Legacy template
-            result = self._create_legacy_template(base_name)
-
-        # Merge each template in the chain
-        for template_name in inheritance_chain[1:]:
-            if template_name in self.templates:
-                template = self.templates[template_name]
-                result = self._merge_template_configs(result, template)
-
-        return result
-
-    def _merge_template_configs(self, base: TemplateConfig, overlay: TemplateConfig) -> TemplateConfig:
-        """Merge two template configurations"""
-        # Merge settings (overlay overrides base)
-        base.settings.update(overlay.settings)
-        base.settings.update(overlay.overrides)  # overrides take precedence
-
-        # Merge lists (concatenate)
-        base.compiler_flags.extend(overlay.compiler_flags)
-        base.linker_flags.extend(overlay.linker_flags)
-        base.cmake_options.extend(overlay.cmake_options)
-        base.dependencies.extend(overlay.dependencies)
-        base.files.extend(overlay.files)
-
-        # Merge dictionaries
-        for key, value in overlay.libraries.items():
-            if key in base.libraries:
-                base.libraries[key].extend(value)
-            else:
-                base.libraries[key] = value
+            base = self._legacy_templates.get(base_name) or self._build_legacy_template(base_name)
 
-        # Merge clang-tidy checks
-        for action, checks in overlay.clang_tidy_checks.items():
-            if action in base.clang_tidy_checks:
-                base.clang_tidy_checks[action].extend(checks)
-            else:
-                base.clang_tidy_checks[action] = checks
+        overlays = [self.templates[name] for name in inheritance_chain[1:] if name in self.templates]
+        if not overlays:
+            return _clone_template(base)
+        layers = [base] + overlays
 
-        # Template additions (concatenate)
-        if overlay.cmake_template_additions:
-            if base.cmake_template_additions:
-                base.cmake_template_additions += "\n\n" + overlay.cmake_template_additions
-            else:
-                base.cmake_template_additions = overlay.cmake_template_additions
-
-        # Use overlay template if provided
-        if overlay.cmake_template:
-            base.cmake_template = overlay.cmake_template
+        # Merge settings (overlay overrides base, overrides take precedence)
+        settings = dict(base.settings)
+        for overlay in overlays:
+            settings.update(overlay.settings)
+            settings.update(overlay.overrides)
 
-        # Update metadata (overlay takes precedence)
-        base.name = overlay.name  # Use the overlay template's name
-        base.description = overlay.description or base.description
-        base.documentation = overlay.documentation or base.documentation
+        # Template additions (concatenate)
+        additions = [layer.cmake_template_additions for layer in layers if layer.cmake_template_additions]
 
-        return base
+        # Build the merged template in one go; lists concatenate down the chain,
+        # while templates and metadata come from the last overlay that sets them
+        return TemplateConfig(
+            name=overlays[-1].name,
+            description=_last_set(layer.description for layer in layers),
+            type=base.type,
+            inherits=base.inherits,
+            settings=_copy_plain(settings),
+            overrides=_copy_plain(base.overrides),
+            compiler_flags=list(itertools.chain.from_iterable(layer.compiler_flags for layer in layers)),
+            linker_flags=list(itertools.chain.from_iterable(layer.linker_flags for layer in layers)),
+            cmake_options=list(itertools.chain.from_iterable(layer.cmake_options for layer in layers)),
+            cmake_template=_last_set(layer.cmake_template for layer in layers),
+            cmake_template_additions="\n\n".join(additions) if additions else base.cmake_template_additions,
+            files=[dict(entry) for entry in itertools.chain.from_iterable(layer.files for layer in layers)],
+            libraries=_merge_list_maps(layer.libraries for layer in layers),
+            dependencies=list(itertools.chain.from_iterable(layer.dependencies for layer in layers)),
+            clang_tidy_checks=_merge_list_maps(layer.clang_tidy_checks for layer in layers),
+            documentation=_last_set(layer.documentation for layer in layers)
+        )
 
     def _apply_user_overrides(self, template: TemplateConfig, user_overrides: Dict[str, Any]):
         """Apply user-specified overrides to template"""
@@ -225,43 +449,34 @@ class TemplateEngine:
 
     def _apply_toggle(self, template: TemplateConfig, toggle_name: str, value: Any):
         """Apply a specific toggle to template configuration"""
-        toggle_config = self.toggles[toggle_name]
+        effects = self._toggle_effects[toggle_name]
 
         # Validate toggle value
-        valid_values = toggle_config.get('values', [])
+        valid_values = effects.valid_values
         if valid_values and value not in valid_values:
             raise ValueError(f"Invalid value '{value}' for toggle '{toggle_name}'. Valid values: {valid_values}")
 
         # Apply toggle effects
         template.settings[toggle_name] = value
-
-        # Apply compiler flags
-        if 'compiler_flags' in toggle_config:
-            flags = toggle_config['compiler_flags']
-            if isinstance(flags, dict):
-                if value in flags:
-                    template.compiler_flags.extend(flags[value])
-            else:
-                template.compiler_flags.extend(flags)
-
-        # Apply CMake options
-        if 'cmake_flag' in toggle_config:
-            cmake_flag = toggle_config['cmake_flag']
-            template.cmake_options.append(f"{cmake_flag}={'ON' if value else 'OFF'}")
-
-        # Apply dependencies
-        if 'dependencies' in toggle_config:
-            deps = toggle_config['dependencies']
-            if isinstance(deps, dict):
-                if value in deps:
-                    template.dependencies.extend(deps[value])
-            else:
-                template.dependencies.extend(deps)
+        template.compiler_flags.extend(effects.compiler_flags_for(value))
+        if effects.cmake_flag is not None:
+            template.cmake_options.append(f"{effects.cmake_flag}={'ON' if value else 'OFF'}")
+        template.dependencies.extend(effects.dependencies_for(value))
 
     def _create_legacy_template(self, preset_name: str, user_overrides: Optional[Dict[str, Any]] = None) -> TemplateConfig:
         """Create a legacy template for backwards compatibility"""
-        user_overrides = user_overrides or {}
+        prototype = self._legacy_templates.get(preset_name)
+        template = _clone_template(prototype) if prototype else self._build_legacy_template(preset_name)
+
+        # Apply user overrides to settings
+        if user_overrides:
+            template.settings.update(user_overrides)
 
+        return template
+
+    @staticmethod
+    def _build_legacy_template(preset_name: str) -> TemplateConfig:
+        """Build the settings-only template behind a legacy preset"""
         base_settings = {
             "sanitizers": preset_name != "minimal",
             "target_type": "library" if preset_name == "library" else "executable",
@@ -272,9 +487,6 @@ class TemplateEngine:
             "exceptions": True
         }
 
-        # Apply user overrides to settings
-        base_settings.update(user_overrides)
-
         return TemplateConfig(
             name=preset_name,
             description=f"Legacy {preset_name} template",
@@ -304,64 +516,58 @@ class TemplateEngine:
             except (KeyError, ValueError):
                 # Fallback: use simple replacement for problematic templates
                 additions = template.cmake_template_additions.replace('{project_name}', project_name)
-            content += "\n\n" + additions
+            content = "\n\n".join((content, additions))
 
         return content
 
     def _generate_default_cmake(self, template: TemplateConfig, project_name: str,
                                cmake_min_version: str, cxx_standard: str) -> str:
         """Generate default CMakeLists.txt based on template settings"""
-        content = f"""cmake_minimum_required(VERSION {cmake_min_version})
+        parts: List[str] = [f"""cmake_minimum_required(VERSION {cmake_min_version})
 project({project_name} LANGUAGES CXX)
 
 set(CMAKE_CXX_STANDARD {cxx_standard})
 set(CMAKE_CXX_STANDARD_REQUIRED ON)
 set(CMAKE_CXX_EXTENSIONS OFF)
-"""
+"""]
 
         # Add dependencies
-        for dep in template.dependencies:
-            content += f"{dep}\n"
-
         if template.dependencies:
-            content += "\n"
+            parts.extend(f"{dep}\n" for dep in template.dependencies)
+            parts.append("\n")
 
         # Add CMake options
-        for option in template.cmake_options:
-            if "=" in option:
-                content += f"set({option})\n"
-            else:
-                content += f"option({option} ON)\n"
-
         if template.cmake_options:
-            content += "\n"
+            parts.extend(
+                f"set({option})\n" if "=" in option else f"option({option} ON)\n"
+                for option in template.cmake_options
+            )
+            parts.append("\n")
 
         # Add compiler warnings
-        content += """# Compiler warnings
+        parts.append("""# Compiler warnings
 add_library(project_warnings INTERFACE)
 target_compile_options(project_warnings INTERFACE
-  $<$<CXX_COMPILER_ID:GNU,Clang>:-Wall -Wextra"""
+  $<$<CXX_COMPILER_ID:GNU,Clang>:-Wall -Wextra""")
 
         # Add additional compiler flags
-        for flag in template.compiler_flags:
-            content += f" {flag}"
+        parts.extend(f" {flag}" for flag in template.compiler_flags)
 
-        content += """>
+        parts.append(""">
   $<$<CXX_COMPILER_ID:MSVC>:/W4>
 )
-"""
+""")
 
         # Add linker flags if any
         if template.linker_flags:
-            content += "\ntarget_link_options(project_warnings INTERFACE"
-            for flag in template.linker_flags:
-                content += f"\n  {flag}"
-            content += "\n)\n"
+            parts.append("\ntarget_link_options(project_warnings INTERFACE")
+            parts.extend(f"\n  {flag}" for flag in template.linker_flags)
+            parts.append("\n)\n")
 
         # Add target based on type
         target_type = template.settings.get('target_type', 'executable')
         if target_type == 'library':
-            content += f"""
+            parts.append(f"""
 # Library target
 add_library({project_name} src/{project_name}.cpp)
 target_include_directories({project_name} PUBLIC include)
@@ -370,15 +576,15 @@ target_link_libraries({project_name} PRIVATE project_warnings)
 # Example executable
 add_executable({project_name}_example examples/main.cpp)
 target_link_libraries({project_name}_example PRIVATE {project_name} project_warnings)
-"""
+""")
         else:
-            content += f"""
+            parts.append(f"""
 # Executable target
 add_executable({project_name} main.cpp)
 target_link_libraries({project_name} PRIVATE project_warnings)
-"""
+""")
 
-        return content
+        return "".join(parts)
 
 
 def main():
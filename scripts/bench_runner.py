@@ -13,7 +13,6 @@ import os
 import pathlib
 import platform
 import re
-import resource
 import shlex
 import subprocess
 import sys
@@ -21,16 +20,20 @@ import time
 from typing import Iterable, List
 
 IMPORTANT_PATTERNS = [
-    re.compile(p, re.IGNORECASE)
-    for p in [
-        r"error",
-        r"warning",
-        r"FAILED",
-        r"ninja:\s*(?:error|warning)",
-        r"The following tests FAILED",
-        r"100% tests passed",
-    ]
+    r"error",
+    r"warning",
+    r"FAILED",
+    r"ninja:\s*(?:error|warning)",
+    r"The following tests FAILED",
+    r"100% tests passed",
 ]
+# Single alternation so each output line is scanned once rather than per pattern.
+IMPORTANT_RE = re.compile("|".join(f"(?:{p})" for p in IMPORTANT_PATTERNS), re.IGNORECASE)
+# Same pattern for scanning raw output, so only matching lines get decoded.
+IMPORTANT_RE_BYTES = re.compile(IMPORTANT_RE.pattern.encode(), re.IGNORECASE)
+READ_CHUNK_SIZE = 1 << 16
+# Log writes are coalesced in memory and reach the disk in large blocks.
+LOG_BUFFER_SIZE = 1 << 20
 
 
 def _filter_lines(stream: Iterable[str]) -> List[str]:
@@ -39,11 +42,25 @@ def _filter_lines(stream: Iterable[str]) -> List[str]:
         text = line.rstrip()
         if not text:
             continue
-        if any(pat.search(text) for pat in IMPORTANT_PATTERNS):
+        if IMPORTANT_RE.search(text):
             highlights.append(text)
     return highlights
 
 
+def _echo_highlights(lines: Iterable[bytes], highlights: List[str]) -> None:
+    matched = [
+        raw.decode("utf-8", errors="replace").rstrip()
+        for raw in lines
+        if IMPORTANT_RE_BYTES.search(raw)
+    ]
+    if not matched:
+        return
+    highlights.extend(matched)
+    # One write and flush per block of output instead of per highlighted line.
+    sys.stdout.write("".join(f"{text}\n" for text in matched))
+    sys.stdout.flush()
+
+
 def _normalize_rss_kib(raw: float) -> float:
     # Linux reports kilobytes, macOS reports bytes.
     if platform.system() == "Darwin":
@@ -74,26 +91,33 @@ def main() -> int:
         command,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
     )
 
     assert process.stdout is not None
-    with open(log_path, "w", encoding="utf-8", errors="replace") as log_file:
-        for line in process.stdout:
-            log_file.write(line)
+    fd = process.stdout.fileno()
+    partial = b""
+    with open(log_path, "wb", buffering=LOG_BUFFER_SIZE) as log_file:
+        while True:
+            chunk = os.read(fd, READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            log_file.write(chunk)
             if args.keep_output:
-                sys.stdout.write(line)
-            else:
-                if any(pat.search(line) for pat in IMPORTANT_PATTERNS):
-                    highlights.append(line.rstrip())
-                    sys.stdout.write(line)
-            sys.stdout.flush()
-
-    returncode = process.wait()
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+                continue
+            # Only complete lines are scanned; the tail waits for more data.
+            *lines, partial = (partial + chunk).split(b"\n")
+            _echo_highlights(lines, highlights)
+        if partial and not args.keep_output:
+            _echo_highlights([partial], highlights)
+
+    # wait4 reports this child's own rusage; RUSAGE_CHILDREN would fold in any
+    # other child this process had already reaped.
+    _, status, usage = os.wait4(process.pid, 0)
+    returncode = process.returncode = os.waitstatus_to_exitcode(status)
     duration = time.perf_counter() - start
 
-    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
     peak_rss_kib = _normalize_rss_kib(float(usage.ru_maxrss))
 
     metrics = {
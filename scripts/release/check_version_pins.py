@@ -15,6 +15,10 @@ FLAKE_FILE = ROOT / "flake.nix"
 DOCKERFILE = ROOT / "containers" / "Dockerfile"
 RELEASE_MANIFEST = ROOT / "src" / "llmtk_bootstrap" / "data" / "releases.json"
 
+HOMEBREW_TARBALL_RE = re.compile(rb"/v([0-9]+\.[0-9]+\.[0-9]+)\.tar\.gz")
+FLAKE_VERSION_RE = re.compile(r"version = \"([^\"]+)\";")
+PLACEHOLDER_SHA256 = "0" * 64
+
 
 class PinMismatch(Exception):
     pass
@@ -24,35 +28,33 @@ def read_version() -> str:
     return VERSION_FILE.read_text().strip()
 
 
-def check_homebrew(version: str) -> None:
-    content = HOMEBREW_FORMULA.read_text()
-    match = re.search(r"/v([0-9]+\.[0-9]+\.[0-9]+)\.tar\.gz", content)
+def check_homebrew(version: str, content: bytes) -> None:
+    match = HOMEBREW_TARBALL_RE.search(content)
     if not match:
         raise PinMismatch("Homebrew formula missing versioned tarball URL")
-    if match.group(1) != version:
-        raise PinMismatch(f"Homebrew formula targets v{match.group(1)} but VERSION is {version}")
+    pinned = match.group(1).decode()
+    if pinned != version:
+        raise PinMismatch(f"Homebrew formula targets v{pinned} but VERSION is {version}")
 
 
-def check_flake(version: str) -> None:
-    content = FLAKE_FILE.read_text()
-    match = re.search(r"version = \"([^\"]+)\";", content)
+def check_flake(version: str, content: str) -> None:
+    match = FLAKE_VERSION_RE.search(content)
     if not match:
         raise PinMismatch("flake.nix missing version attribute")
     if match.group(1) != version:
         raise PinMismatch(f"flake.nix version is {match.group(1)} but VERSION is {version}")
 
 
-def check_dockerfile(version: str) -> None:
-    content = DOCKERFILE.read_text()
-    if f"pip install --no-cache-dir ." not in content:
+def check_dockerfile(version: str, content: bytes) -> None:
+    if b"pip install --no-cache-dir ." not in content:
         raise PinMismatch("Dockerfile does not install local package")
-    if f"llmtk --bootstrap-info" not in content:
+    if b"llmtk --bootstrap-info" not in content:
         raise PinMismatch("Dockerfile missing bootstrap smoke test")
     # Optionally ensure version comment? (no direct reference)
 
 
-def check_release_manifest(version: str) -> None:
-    data = json.loads(RELEASE_MANIFEST.read_text())
+def check_release_manifest(version: str, content: str) -> None:
+    data = json.loads(content)
     entry = data.get(version)
     if not entry:
         raise PinMismatch(f"Release manifest missing entry for version {version}")
@@ -60,7 +62,7 @@ def check_release_manifest(version: str) -> None:
     if f"v{version}" not in url:
         raise PinMismatch(f"Release manifest for {version} points to unexpected URL: {url}")
     sha = entry.get("sha256", "")
-    if len(sha) != 64 or set(sha) == {"0"}:
+    if len(sha) != 64 or sha == PLACEHOLDER_SHA256:
         raise PinMismatch(f"Release manifest for {version} has invalid sha256: {sha}")
 
 
@@ -69,11 +71,18 @@ def main() -> int:
     parser.parse_args()
 
     version = read_version()
-    checks = [check_homebrew, check_flake, check_dockerfile, check_release_manifest]
+    # Each check gets its file's contents, read exactly once here. Checks that
+    # only scan for ASCII markers take raw bytes and skip decoding.
+    checks = [
+        (check_homebrew, HOMEBREW_FORMULA, Path.read_bytes),
+        (check_flake, FLAKE_FILE, Path.read_text),
+        (check_dockerfile, DOCKERFILE, Path.read_bytes),
+        (check_release_manifest, RELEASE_MANIFEST, Path.read_text),
+    ]
     problems = []
-    for check in checks:
+    for check, path, read in checks:
         try:
-            check(version)
+            check(version, read(path))
         except FileNotFoundError as exc:
             problems.append(f"Missing file: {exc.filename}")
         except PinMismatch as exc:
@@ -7,10 +7,13 @@ import argparse
 import hashlib
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
 SHA256_FILENAME = "SHA256SUMS"
+HASH_CHUNK_SIZE = 1 << 20
+MAX_HASH_WORKERS = 8
 
 
 def iter_artifacts(directory: Path, recursive: bool = False) -> Iterable[Path]:
@@ -20,10 +23,24 @@ def iter_artifacts(directory: Path, recursive: bool = False) -> Iterable[Path]:
         yield from (p for p in directory.iterdir() if p.is_file())
 
 
+def sha256_file(path: Path) -> str:
+    with path.open("rb") as fh:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := fh.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
 def write_checksums(artifacts: Iterable[Path], output: Path) -> None:
+    paths = sorted(artifacts)
+    # hashlib releases the GIL while digesting, so artifacts hash in parallel;
+    # map() keeps results in sorted order for a deterministic SHA256SUMS.
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_HASH_WORKERS, len(paths)))) as pool:
+        digests = list(pool.map(sha256_file, paths))
     with output.open("w", encoding="utf-8") as fh:
-        for artifact in sorted(artifacts):
-            sha = hashlib.sha256(artifact.read_bytes()).hexdigest()
+        for artifact, sha in zip(paths, digests):
             fh.write(f"{sha}  {artifact.name}\n")
     print(f"✅ Wrote {output}")
 
@@ -1,19 +1,24 @@
+from __future__ import annotations
+
 import argparse
-import hashlib
+import functools
+import io
 import json
 import os
 import shutil
-import subprocess
 import sys
-import tarfile
-import tempfile
 import textwrap
-import urllib.request
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from importlib import resources
 from importlib import metadata
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, NoReturn, Optional
+
+# hashlib, tarfile, tempfile, urllib.request and rapidgzip are imported where
+# used: an installed release runs llmtk without paying for them.
+if TYPE_CHECKING:  # pragma: no cover
+    import tarfile
 
 # Locations
 DEFAULT_INSTALL_DIR = Path(os.environ.get("LLMTK_BOOTSTRAP_INSTALL", Path.home() / ".local" / "share" / "llm-cpp-toolkit"))
@@ -21,6 +26,12 @@ DEFAULT_CACHE_DIR = Path(os.environ.get("LLMTK_BOOTSTRAP_CACHE", Path.home() / "
 RELEASE_DATA_PACKAGE = "llmtk_bootstrap.data"
 RELEASE_DATA_FILE = "releases.json"
 SKIP_VERIFY = os.environ.get("LLMTK_BOOTSTRAP_SKIP_VERIFY") == "1"
+MARKER_FILE = ".llmtk.ok"
+# Multiple of tarfile.BLOCKSIZE so tarfile's stream buffer never splits a block
+IO_CHUNK_SIZE = 8 * 1024 * 1024
+RAPIDGZIP_CHUNK_SIZE = 4 * 1024 * 1024
+EXTRACT_WORKERS = 4
+EXTRACT_MAX_PENDING = 64
 
 
 @dataclass
@@ -28,6 +39,12 @@ class ReleaseDescriptor:
     version: str
     url: str
     sha256: str
+    root: Optional[str] = None  # llmtk root inside the archive, from the manifest's root_dir
+    digest: bytes = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Raw 32-byte form, compared against hasher.digest() without hex encoding
+        self.digest = bytes.fromhex(self.sha256)
 
     @property
     def short_sha(self) -> str:
@@ -38,11 +55,13 @@ class BootstrapError(RuntimeError):
     """Raised when the bootstrap process fails."""
 
 
+@functools.lru_cache(maxsize=None)
 def _load_release_manifest() -> dict:
     with resources.files(RELEASE_DATA_PACKAGE).joinpath(RELEASE_DATA_FILE).open("r", encoding="utf-8") as fh:
         return json.load(fh)
 
 
+@functools.lru_cache(maxsize=None)
 def _toolkit_version() -> str:
     try:
         return metadata.version("llm-cpp-toolkit")
@@ -75,58 +94,163 @@ def _resolve_release(version: str, releases: dict) -> ReleaseDescriptor:
                 """.strip()
             )
         )
-    if len(sha) != 64:
+    try:
+        valid = len(bytes.fromhex(sha)) == 32
+    except ValueError:
+        valid = False
+    if not valid:
         raise BootstrapError(f"Invalid sha256 for release {version}: {sha}")
-    return ReleaseDescriptor(version=version, url=url, sha256=sha)
+    root = data.get("root_dir") or None
+    if root is not None and (Path(root).is_absolute() or os.pardir in Path(root).parts):
+        raise BootstrapError(f"Invalid root_dir for release {version}: {root}")
+    return ReleaseDescriptor(version=version, url=url, sha256=sha, root=root)
+
 
+class _HashingReader(io.RawIOBase):
+    """Raw stream that hashes and caches every byte read from ``source``."""
 
-def _download_release(rel: ReleaseDescriptor, cache_dir: Path) -> Path:
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    tar_path = cache_dir / f"{rel.version}.tar.gz"
-    if tar_path.exists():
-        if SKIP_VERIFY or _verify_file(tar_path, rel.sha256):
-            return tar_path
-        tar_path.unlink()
+    def __init__(self, source, hasher, sink) -> None:
+        self._source = source
+        self._hasher = hasher
+        self._sink = sink
 
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._source.readinto(buffer)
+        if count:
+            # Release the views before returning: BufferedReader reuses ``buffer``
+            with memoryview(buffer) as whole, whole[:count] as view:
+                self._hasher.update(view)
+                self._sink.write(view)
+        return count
+
+
+def _download_and_extract(rel: ReleaseDescriptor, tar_path: Path, dest_dir: Path) -> Path:
+    """Download, hash, cache and extract the release tarball in a single pass."""
+    import hashlib
+    import tarfile
+    import urllib.request
+
+    tar_path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = tar_path.with_suffix(".tmp")
     print(f"📦 Downloading llmtk release {rel.version} ({rel.short_sha})")
-    with urllib.request.urlopen(rel.url) as response, open(tmp_path, "wb") as dst:
-        hasher = hashlib.sha256()
-        while True:
-            chunk = response.read(1024 * 1024)
-            if not chunk:
-                break
-            dst.write(chunk)
-            hasher.update(chunk)
-    digest = hasher.hexdigest()
-    if not SKIP_VERIFY and digest != rel.sha256:
+    hasher = hashlib.sha256(usedforsecurity=True)
+    extract_error: Optional[Exception] = None
+    try:
+        # Network reads return short chunks; the large write buffer coalesces them
+        with urllib.request.urlopen(rel.url) as response, \
+                open(tmp_path, "wb", buffering=IO_CHUNK_SIZE) as sink:
+            stream = io.BufferedReader(_HashingReader(response, hasher, sink), IO_CHUNK_SIZE)
+            try:
+                with tarfile.open(fileobj=stream, mode="r|gz", bufsize=IO_CHUNK_SIZE) as archive:
+                    extracted_root = _extract_members(archive, dest_dir)
+            except (tarfile.TarError, OSError, BootstrapError) as exc:
+                extract_error = exc
+            # Hash the trailing padding too, so the digest covers the whole file
+            buffer = bytearray(IO_CHUNK_SIZE)
+            while stream.readinto(buffer):
+                pass
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if not SKIP_VERIFY and hasher.digest() != rel.digest:
         tmp_path.unlink(missing_ok=True)
         raise BootstrapError(
-            f"Checksum mismatch for {rel.url}\nExpected {rel.sha256}\nGot      {digest}"
+            f"Checksum mismatch for {rel.url}\nExpected {rel.sha256}\nGot      {hasher.hexdigest()}"
         )
+    if extract_error is not None:
+        tmp_path.unlink(missing_ok=True)
+        if isinstance(extract_error, BootstrapError):
+            raise extract_error
+        raise BootstrapError(f"Failed to extract {rel.url}: {extract_error}") from extract_error
     tmp_path.rename(tar_path)
-    return tar_path
+    return extracted_root
 
 
-def _verify_file(path: Path, expected_sha: str) -> bool:
+def _verify_file(path: Path, expected_digest: bytes) -> bool:
+    import hashlib
+
     if not path.exists():
         return False
-    hasher = hashlib.sha256()
     with open(path, "rb") as fh:
-        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest() == expected_sha
-
-
-def _safe_extract(tar_path: Path, dest_dir: Path) -> Path:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashed in C without the GIL
+            hasher = hashlib.file_digest(fh, "sha256")
+        else:
+            hasher = hashlib.sha256(usedforsecurity=True)
+            buffer = bytearray(IO_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while count := fh.readinto(buffer):
+                hasher.update(view[:count])
+    return hasher.digest() == expected_digest
+
+
+def _check_member(member: tarfile.TarInfo, dest_resolved: Path) -> None:
+    """Reject members escaping ``dest_resolved`` on interpreters without extraction filters."""
+    target = (dest_resolved / member.name).resolve()
+    if member.issym():
+        link_target = (target.parent / member.linkname).resolve()
+    elif member.islnk():
+        link_target = (dest_resolved / member.linkname).resolve()
+    else:
+        link_target = target
+    if not (target.is_relative_to(dest_resolved) and link_target.is_relative_to(dest_resolved)):
+        raise BootstrapError(f"Unsafe path detected in archive: {member.name}")
+
+
+def _write_member(path: Path, data: bytes, mode: Optional[int], mtime: Optional[float]) -> None:
+    """Write one extracted regular file the way ``TarFile.extract`` would."""
+    with open(path, "wb") as fh:
+        fh.write(data)
+    if mode is not None:
+        os.chmod(path, mode)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _extract_members(archive: tarfile.TarFile, dest_dir: Path) -> Path:
+    import tarfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Extraction filters exist from 3.12 and were backported to 3.8.17+/3.9.17+/3.10.12+/3.11.4+
+    data_filter = getattr(tarfile, "data_filter", None)
+    extract_filter = {"filter": "data"} if data_filter else {}
     dest_dir.mkdir(parents=True, exist_ok=True)
-    with tarfile.open(tar_path, "r:gz") as archive:
-        members = archive.getmembers()
-        for member in members:
-            target = dest_dir / member.name
-            if not str(target.resolve()).startswith(str(dest_dir.resolve())):
-                raise BootstrapError(f"Unsafe path detected in archive: {member.name}")
-        archive.extractall(dest_dir)
+    dest_resolved = dest_dir.resolve()
+    known_dirs = {dest_resolved}
+    # Regular files are decoded here and written by the pool, which overlaps the
+    # open/write/chmod syscalls; at most EXTRACT_MAX_PENDING files are held in memory.
+    pending = {}
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+        for member in archive:
+            if not data_filter:
+                _check_member(member, dest_resolved)
+            try:
+                if data_filter and member.isreg():
+                    info = data_filter(member, str(dest_resolved))
+                    path = dest_resolved / info.name
+                    if path.parent not in known_dirs:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        known_dirs.add(path.parent)
+                    data = archive.extractfile(member).read()
+                    if path in pending:  # duplicate entry: the later one must win
+                        pending.pop(path).result()
+                    pending[path] = pool.submit(_write_member, path, data, info.mode, info.mtime)
+                else:
+                    if member.islnk():  # the link target may still be in flight
+                        while pending:
+                            pending.pop(next(iter(pending))).result()
+                    archive.extract(member, dest_resolved, **extract_filter)
+            except tarfile.TarError as exc:  # rejected by the extraction filter
+                raise BootstrapError(f"Unsafe member in archive: {exc}") from exc
+            # Stream mode still records every TarInfo; drop them to keep memory flat
+            archive.members.clear()
+            if len(pending) > EXTRACT_MAX_PENDING:
+                pending.pop(next(iter(pending))).result()
+        for future in pending.values():
+            future.result()
     # Determine extracted root directory
     top_level = sorted(dest_dir.iterdir())
     if len(top_level) == 1 and top_level[0].is_dir():
@@ -134,29 +258,97 @@ def _safe_extract(tar_path: Path, dest_dir: Path) -> Path:
     return dest_dir
 
 
-def _ensure_release_install(rel: ReleaseDescriptor, install_dir: Path, cache_dir: Path) -> Path:
+def _safe_extract(tar_path: Path, dest_dir: Path) -> Path:
+    import tarfile
+
+    try:  # optional parallel gzip decoder
+        import rapidgzip  # type: ignore
+    except ImportError:
+        rapidgzip = None  # type: ignore
+
+    if rapidgzip is not None:
+        # Seekable file on disk: decompress on all cores
+        with rapidgzip.RapidgzipFile(
+            str(tar_path), parallelization=os.cpu_count() or 1, chunk_size=RAPIDGZIP_CHUNK_SIZE
+        ) as gz, tarfile.open(fileobj=gz, mode="r|", bufsize=IO_CHUNK_SIZE) as archive:
+            return _extract_members(archive, dest_dir)
+    with tarfile.open(tar_path, "r|gz", bufsize=IO_CHUNK_SIZE) as archive:
+        return _extract_members(archive, dest_dir)
+
+
+def _ensure_release_install(
+    rel: ReleaseDescriptor, install_dir: Path, cache_dir: Path, force: bool = False
+) -> Path:
+    import errno
+    import tempfile
+
     target = install_dir / rel.version
-    marker = target / ".llmtk.ok"
-    if marker.exists():
-        return Path(marker.read_text().strip()).resolve()
-
-    if target.exists():
-        shutil.rmtree(target)
-    target.mkdir(parents=True, exist_ok=True)
-
-    tarball = _download_release(rel, cache_dir)
-    with tempfile.TemporaryDirectory(prefix="llmtk-extract-", dir=str(target.parent)) as tmp:
-        tmp_path = Path(tmp)
-        extracted_root = _safe_extract(tarball, tmp_path)
-        # Move into place
-        for item in extracted_root.iterdir():
-            shutil.move(str(item), target / item.name)
-    root = _discover_root(target)
+    marker = target / MARKER_FILE
+    if not force:
+        installed = _read_marker(marker)
+        if installed is not None:
+            return installed
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # A stale or forced install is deleted while the new release is fetched and extracted
+    cleanup = _discard_tree(target) if target.exists() else None
+    try:
+        tarball = cache_dir / f"{rel.version}.tar.gz"
+        with tempfile.TemporaryDirectory(prefix="llmtk-extract-", dir=str(target.parent)) as tmp:
+            # Extract below the temp dir so the tree keeps default permissions, not mkdtemp's 0700
+            extract_dir = Path(tmp) / "release"
+            if tarball.exists() and (SKIP_VERIFY or _verify_file(tarball, rel.digest)):
+                extracted_root = _safe_extract(tarball, extract_dir)
+            else:
+                extracted_root = _download_and_extract(rel, tarball, extract_dir)
+            if rel.root:
+                extracted_root = extract_dir / rel.root
+                if not extracted_root.is_dir():
+                    raise BootstrapError(f"Release archive has no {rel.root} directory")
+            # Move into place; the temp dir shares target's filesystem, so one rename suffices
+            try:
+                os.rename(extracted_root, target)
+            except OSError as exc:
+                if exc.errno != errno.EXDEV:
+                    raise
+                target.mkdir()
+                for item in extracted_root.iterdir():
+                    shutil.move(str(item), target / item.name)
+    finally:
+        if cleanup is not None:
+            cleanup.join()
+    # With a manifest root_dir the llmtk root is the renamed directory itself
+    root = target if rel.root else _discover_root(target)
     marker.write_text(str(root.resolve()))
     (install_dir / "current").write_text(rel.version)
     return root
 
 
+def _discard_tree(path: Path) -> threading.Thread:
+    """Move ``path`` aside and delete it on a background thread; join the returned thread."""
+    import tempfile
+
+    trash = Path(tempfile.mkdtemp(prefix=".llmtk-stale-", dir=str(path.parent)))
+    path.rename(trash / path.name)
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True})
+    thread.start()
+    return thread
+
+
+def _read_marker(marker: Path) -> Optional[Path]:
+    """Return the llmtk root recorded in an install marker, or None if there is none."""
+    try:
+        fd = os.open(marker, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        data = os.read(fd, 4096)
+    finally:
+        os.close(fd)
+    # The marker holds the already-resolved root written at install time
+    return Path(data.decode().strip())
+
+
 def _discover_root(directory: Path) -> Path:
     # Look for cli/llmtk script to anchor root
     for candidate in [directory] + [p for p in directory.iterdir() if p.is_dir()]:
@@ -165,7 +357,7 @@ def _discover_root(directory: Path) -> Path:
     raise BootstrapError(f"Unable to locate llmtk root inside {directory}")
 
 
-def _run_llmtk(root: Path, argv: list[str]) -> int:
+def _run_llmtk(root: Path, argv: list[str]) -> NoReturn:
     cli_path = root / "cli" / "llmtk"
     if not cli_path.exists():
         raise BootstrapError(f"llmtk executable missing at {cli_path}")
@@ -173,7 +365,10 @@ def _run_llmtk(root: Path, argv: list[str]) -> int:
     env.setdefault("LLMTK_DIR", str(root))
     python_exe = env.get("LLMTK_BOOTSTRAP_PYTHON", sys.executable)
     cmd = [python_exe, str(cli_path)] + argv
-    return subprocess.call(cmd, env=env)
+    # Replace this process: exec discards anything still buffered
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvpe(python_exe, cmd, env)
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -188,13 +383,26 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def _llmtk_args(ns: argparse.Namespace) -> list[str]:
+    args = ns.args
+    if ns.help and "--help" not in args:
+        args = ["--help"] + args
+    return args
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     ns = parse_args(argv)
     version = _toolkit_version()
     if ns.use_source:
         root = ns.use_source.resolve()
         print(f"🛠️  Running llmtk from source at {root}")
-        return _run_llmtk(root, ns.args)
+        _run_llmtk(root, ns.args)
+
+    if not (ns.force_reinstall or ns.bootstrap_info):
+        # Hot path: the release is already installed, no need for the manifest
+        root = _read_marker(ns.install_dir / version / MARKER_FILE)
+        if root is not None:
+            _run_llmtk(root, _llmtk_args(ns))
 
     releases = _load_release_manifest()
     rel = _resolve_release(version, releases)
@@ -202,11 +410,10 @@ def main(argv: Optional[list[str]] = None) -> int:
     if ns.force_reinstall:
         dest = ns.install_dir / rel.version
         if dest.exists():
-            shutil.rmtree(dest)
-            print(f"♻️  Cleared cached release at {dest}")
+            print(f"♻️  Clearing cached release at {dest}")
 
     try:
-        root = _ensure_release_install(rel, ns.install_dir, ns.cache_dir)
+        root = _ensure_release_install(rel, ns.install_dir, ns.cache_dir, force=ns.force_reinstall)
     except BootstrapError as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
@@ -224,10 +431,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         }, indent=2))
         return 0
 
-    args = ns.args
-    if ns.help and "--help" not in args:
-        args = ["--help"] + args
-    return _run_llmtk(root, args)
+    _run_llmtk(root, _llmtk_args(ns))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Tests for template resolution in llmtk's template engine."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "modules"))
+
+import template_engine  # noqa: E402
+
+
+def make_engine(tmp_path, monkeypatch):
+    """Build an engine on the shipped templates with a throwaway disk cache."""
+    monkeypatch.setattr(template_engine, "TEMPLATE_CACHE_FILE", tmp_path / "templates.marshal")
+    return template_engine.TemplateEngine(ROOT / "templates", ROOT / "manifest")
+
+
+def test_resolve_cache_keeps_override_order(tmp_path, monkeypatch):
+    """Overrides apply in dict order, so the cache must not merge reorderings."""
+    engine = make_engine(tmp_path, monkeypatch)
+    first = engine.resolve_template("fast-iter", {"rtti": False, "exceptions": False})
+    second = engine.resolve_template("fast-iter", {"exceptions": False, "rtti": False})
+
+    fresh = make_engine(tmp_path, monkeypatch).resolve_template(
+        "fast-iter", {"exceptions": False, "rtti": False})
+
+    assert first.compiler_flags[-2:] == ["-fno-rtti", "-fno-exceptions"]
+    assert second.compiler_flags == fresh.compiler_flags
+    assert second.compiler_flags[-2:] == ["-fno-exceptions", "-fno-rtti"]
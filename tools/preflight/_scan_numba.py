@@ -0,0 +1,149 @@
+"""
+Numba-compiled fallback scanner for very large files
+
+Runs the fallback delimiter and quote state machines over raw UTF-8 bytes.
+Only ASCII bytes and the multi-byte line breaks matter to them, so the results
+match scanning the decoded text. Importing this module requires numpy and
+numba; callers treat ImportError as "not available".
+"""
+
+import numpy as np
+from numba import njit
+
+# Record kinds returned by the scanners
+UNBALANCED, MISMATCHED, UNCLOSED, UNCLOSED_QUOTE, UNCLOSED_MULTILINE = range(5)
+
+
+def as_buffer(source) -> np.ndarray:
+    """View bytes or an mmap as a uint8 array without copying."""
+    return np.frombuffer(source, dtype=np.uint8)
+
+
+@njit(cache=True)
+def _may_break(b):
+    """Whether byte ``b`` can start a line break; keeps _break_length calls rare."""
+    return b <= 30 or b == 0xC2 or b == 0xE2
+
+
+@njit(cache=True)
+def _break_length(buf, i):
+    """Length of the line break at ``i`` (as str.splitlines() sees it), or 0."""
+    b = buf[i]
+    if b == 10 or b == 11 or b == 12 or 28 <= b <= 30:
+        return 1
+    if b == 13:
+        return 2 if i + 1 < len(buf) and buf[i + 1] == 10 else 1
+    if b == 0xC2 and i + 1 < len(buf) and buf[i + 1] == 0x85:
+        return 2
+    if b == 0xE2 and i + 2 < len(buf) and buf[i + 1] == 0x80 and (buf[i + 2] == 0xA8 or buf[i + 2] == 0xA9):
+        return 3
+    return 0
+
+
+@njit(cache=True)
+def scan_delimiters(buf):
+    """Return (kind, offset, line, line start, symbol, expected) delimiter records."""
+    found = []
+    stack = []  # (symbol, offset, line, line start) of open delimiters
+    n = len(buf)
+    line = 1
+    line_start = 0
+    in_string = 0
+    i = 0
+    while i < n:
+        b = buf[i]
+        size = _break_length(buf, i) if _may_break(b) else 0
+        if size:
+            i += size
+            line += 1
+            line_start = i
+            in_string = 0  # string state resets per line
+            continue
+
+        if in_string:
+            # A backslash escapes the next character, unless that is a line break
+            if b == 92 and i + 1 < n and _break_length(buf, i + 1) == 0:
+                i += 2
+                continue
+            if b == in_string:
+                in_string = 0
+        elif b == 34 or b == 39:
+            in_string = b
+        elif b == 40 or b == 91 or b == 123:
+            stack.append((b, i, line, line_start))
+        elif b == 41 or b == 93 or b == 125:
+            if len(stack) == 0:
+                found.append((UNBALANCED, i, line, line_start, b, 0))
+            else:
+                opener = stack.pop()[0]
+                expected = 41 if opener == 40 else opener + 2  # ')' after '(', else ']' / '}'
+                if expected != b:
+                    found.append((MISMATCHED, i, line, line_start, b, expected))
+        i += 1
+
+    for symbol, offset, open_line, open_line_start in stack:
+        found.append((UNCLOSED, offset, open_line, open_line_start, symbol, 0))
+    return found
+
+
+@njit(cache=True)
+def scan_quotes(buf):
+    """Return (kind, offset, line, line start, quote, 0) quote records."""
+    found = []
+    n = len(buf)
+    line = 1
+    line_start = 0
+    in_multiline = 0
+    multiline_offset = 0
+    multiline_line = 0
+    multiline_line_start = 0
+    i = 0
+    while i < n:
+        b = buf[i]
+        size = _break_length(buf, i) if _may_break(b) else 0
+        if size:
+            i += size
+            line += 1
+            line_start = i
+            continue
+
+        if in_multiline:
+            # Only the closing marker matters; escapes aren't honoured
+            if b == in_multiline and i + 2 < n and buf[i + 1] == b and buf[i + 2] == b:
+                in_multiline = 0
+                i += 3
+                continue
+        elif b == 34 or b == 39:
+            if i + 2 < n and buf[i + 1] == b and buf[i + 2] == b:
+                in_multiline = b
+                multiline_offset = i
+                multiline_line = line
+                multiline_line_start = line_start
+                i += 3
+                continue
+
+            # Single-line literal: find its unescaped closing quote on this line
+            j = i + 1
+            closed = False
+            while j < n:
+                c = buf[j]
+                if _may_break(c) and _break_length(buf, j):
+                    break
+                if c == 92 and j + 1 < n and _break_length(buf, j + 1) == 0:
+                    j += 2
+                    continue
+                if c == b:
+                    closed = True
+                    break
+                j += 1
+            if not closed:
+                found.append((UNCLOSED_QUOTE, i, line, line_start, b, 0))
+                i = j
+                continue
+            i = j + 1
+            continue
+        i += 1
+
+    if in_multiline:
+        found.append((UNCLOSED_MULTILINE, multiline_offset, multiline_line, multiline_line_start, in_multiline, 0))
+    return found
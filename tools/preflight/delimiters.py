@@ -5,7 +5,20 @@ Implements Tree-sitter-based and fallback stack checking for balanced
 delimiters and quotes.
 """
 
+import hashlib
+import json
+import mmap
+import os
 import pathlib
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import partial
+from itertools import accumulate
 from typing import Dict, List, Optional, Set, Tuple
 
 from .reporters import Finding
@@ -20,6 +33,203 @@ except ImportError:  # pragma: no cover
     Parser = None  # type: ignore
     TREE_SITTER_AVAILABLE = False
 
+# Hyperscan (python-hyperscan) speeds up the fallback scan when installed
+try:  # pragma: no cover - import availability depends on environment
+    import hyperscan  # type: ignore
+
+    HYPERSCAN_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    hyperscan = None  # type: ignore
+    HYPERSCAN_AVAILABLE = False
+
+# The numba-compiled scanner (numpy + numba) takes over very large files
+try:  # pragma: no cover - import availability depends on environment
+    from . import _scan_numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _scan_numba = None  # type: ignore
+    NUMBA_AVAILABLE = False
+
+# Tree-sitter findings are cached on disk per (content, language, grammar);
+# bump PARSE_CACHE_VERSION whenever the stored findings change shape.
+PARSE_CACHE_VERSION = "1"
+PARSE_CACHE_DIR = pathlib.Path(os.environ.get(
+    "LLMTK_PREFLIGHT_CACHE", pathlib.Path.home() / ".cache" / "llm-cpp-toolkit" / "parse-cache"))
+# Parsed trees kept in memory per run, so duplicate content is parsed once
+TREE_CACHE_SIZE = 128
+# Most recent tree per path, so a re-check after an edit reparses incrementally
+EDIT_CACHE_SIZE = 256
+# Files at least this large are memory-mapped instead of read into a copy
+MMAP_MIN_SIZE = 64 * 1024
+# Fallback checks on files at least this large use the numba scanner, if available
+NUMBA_MIN_SIZE = 1024 * 1024
+
+
+def _read_source(file_path: pathlib.Path):
+    """Return the file's contents as bytes, or as a read-only mmap if it is large."""
+    with open(file_path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size >= MMAP_MIN_SIZE:
+            try:
+                # The mapping stays valid after the file is closed
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+        return fh.read()
+
+
+class ParseCache:
+    """On-disk cache of tree-sitter findings keyed by file content hash."""
+
+    def __init__(self, root: pathlib.Path, grammar_version: str):
+        self.entries = root / "entries"
+        self.enabled = True
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            stamps = {"version": PARSE_CACHE_VERSION, "grammar-version": grammar_version}
+            if any(self._read_stamp(root / name) != value for name, value in stamps.items()):
+                # Schema or grammar changed: every stored entry is stale
+                shutil.rmtree(self.entries, ignore_errors=True)
+                for name, value in stamps.items():
+                    (root / name).write_text(value + "\n", encoding="utf-8")
+        except OSError:
+            self.enabled = False
+
+    @staticmethod
+    def _read_stamp(path: pathlib.Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+    def _entry_path(self, digest: str, language: str) -> pathlib.Path:
+        return self.entries / digest[:2] / f"{digest[2:]}.{language}.json"
+
+    def get(self, digest: str, language: str, file_path: pathlib.Path) -> Optional[List[Finding]]:
+        """Return cached findings for this content, re-targeted at ``file_path``."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._entry_path(digest, language), encoding="utf-8") as fh:
+                records = json.load(fh)
+            file_name = sys.intern(str(file_path))
+            return [Finding(file=file_name, **record) for record in records]
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, digest: str, language: str, findings: List[Finding]) -> None:
+        """Store findings for this content; failures only cost a future cache miss."""
+        if not self.enabled:
+            return
+        records = []
+        for finding in findings:
+            record = finding.to_dict()
+            del record["file"]  # identical content may live at several paths
+            records.append(record)
+        entry = self._entry_path(digest, language)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=entry.parent)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(records, fh)
+            os.replace(tmp_name, entry)  # atomic: readers never see a partial entry
+        except OSError:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+# Token patterns for the fallback scanner, so the per-character work runs in
+# the C regex engine.  Line breaks are exactly those str.splitlines() honours;
+# single-line string literals never span one, and their closing quote is
+# captured only when present.
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_BREAK_RE = re.compile(f'\r\n|[{_LINE_BREAKS}]')
+_BYTES_LINE_BREAK_RE = re.compile(rb'[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]')
+
+
+def _string_literal(quote: str) -> str:
+    """Pattern for a backslash-escaped string literal confined to one line.
+
+    Unrolled as plain-run (escape plain-run)*, so text up to the next
+    backslash or quote is consumed by one character-class sweep.
+    """
+    plain = f'[^{quote}\\\\{_LINE_BREAKS}]*'
+    return f'{quote}{plain}(?:\\\\[^{_LINE_BREAKS}]?{plain})*({quote})?'
+
+
+# Closer expected for each opener, keyed by character and by byte value
+_CLOSE_FOR = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = frozenset(_CLOSE_FOR.values())
+_EXPECTED = {ord(opener): ord(closer) for opener, closer in _CLOSE_FOR.items()}
+
+_DELIMITER_TOKEN_RE = re.compile('|'.join((_string_literal('"'), _string_literal("'"), r'[()\[\]{}]')))
+_QUOTE_TOKEN_RE = re.compile('|'.join(('"""', "'''", _string_literal('"'), _string_literal("'"))))
+
+
+def _common_prefix_length(old: bytes, new: bytes, limit: int) -> int:
+    """Length of the longest common prefix, found by bisecting slice compares."""
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _point(data: bytes, offset: int) -> Tuple[int, int]:
+    """Tree-sitter (row, byte column) of ``offset``."""
+    return data.count(b"\n", 0, offset), offset - (data.rfind(b"\n", 0, offset) + 1)
+
+
+def _input_edit(old: bytes, new: bytes) -> Dict[str, object]:
+    """Describe the change from ``old`` to ``new`` as one tree-sitter edit.
+
+    The edit spans everything between the common prefix and common suffix.
+    """
+    limit = min(len(old), len(new))
+    start = _common_prefix_length(old, new, limit)
+    suffix = _common_prefix_length(old[::-1], new[::-1], limit - start)
+    old_end, new_end = len(old) - suffix, len(new) - suffix
+    return {
+        "start_byte": start,
+        "old_end_byte": old_end,
+        "new_end_byte": new_end,
+        "start_point": _point(old, start),
+        "old_end_point": _point(old, old_end),
+        "new_end_point": _point(new, new_end),
+    }
+
+
+class _LineIndex:
+    """Maps offsets in ``content`` to lines; the index is built on first use."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self._starts: Optional[List[int]] = None
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """Return the (1-based line, 0-based column) of ``offset``."""
+        if self._starts is None:
+            self._starts = [0]
+            self._starts.extend(accumulate(map(len, self.content.splitlines(keepends=True))))
+        line_num = bisect_right(self._starts, offset)
+        return line_num, offset - self._starts[line_num - 1]
+
+    def snippet(self, offset: int, before: int, after: int) -> str:
+        """Return the stripped text from ``before`` to ``after`` columns around ``offset`` on its line."""
+        line_num, col = self.locate(offset)
+        start = self._starts[line_num - 1]
+        end = _LINE_BREAK_RE.search(self.content, start)
+        line = self.content[start:end.start() if end else len(self.content)]
+        return line[max(0, col-before):col+after].strip()
+
 
 class DelimiterChecker:
     """Base class for delimiter checking."""
@@ -28,18 +238,21 @@ class DelimiterChecker:
         """Check a file for delimiter issues."""
         raise NotImplementedError
 
+    def clear_caches(self) -> None:
+        """Release per-run caches once a batch of files has been checked."""
+
 
 class FallbackDelimiterChecker(DelimiterChecker):
     """Fallback delimiter checker using simple line-by-line parsing."""
 
-    PAIRS = {'(': ')', '[': ']', '{': '}'}
-    OPEN = set(PAIRS.keys())
-    CLOSE = set(PAIRS.values())
+    PAIRS = _CLOSE_FOR
+    OPEN = frozenset(_CLOSE_FOR)
+    CLOSE = _CLOSERS
 
     def check_file(self, file_path: pathlib.Path) -> List[Finding]:
         """Check file using fallback line-by-line parser."""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            source = _read_source(file_path)
         except Exception:
             return [Finding(
                 file=str(file_path),
@@ -51,73 +264,164 @@ class FallbackDelimiterChecker(DelimiterChecker):
                 severity="error"
             )]
 
+        if NUMBA_AVAILABLE and len(source) >= NUMBA_MIN_SIZE and self._is_utf8(source):
+            return self._check_compiled(file_path, source)
+
+        # Decoding the raw bytes keeps \r line breaks, which the scanners
+        # treat exactly like the \n that text mode would translate them to
+        content = str(source, 'utf-8', 'ignore')
+
+        # One line index serves both checks, so it is built at most once per file
+        lines = _LineIndex(content)
         findings = []
-        findings.extend(self._check_delimiters(file_path, content))
-        findings.extend(self._check_quotes(file_path, content))
+        findings.extend(self._check_delimiters(file_path, content, lines))
+        findings.extend(self._check_quotes(file_path, content, lines))
 
         return findings
 
-    def _check_delimiters(self, file_path: pathlib.Path, content: str) -> List[Finding]:
-        """Check delimiter balance using stack-based approach."""
-        findings = []
-        stack = []  # Stack of (symbol, line, col)
+    @staticmethod
+    def _is_utf8(source) -> bool:
+        # Invalid bytes vanish when decoding with errors='ignore', which can
+        # join the characters around them; the byte scanner can't model that
+        try:
+            str(source, 'utf-8')
+        except UnicodeDecodeError:
+            return False
+        return True
 
-        lines = content.splitlines()
-        for line_num, line in enumerate(lines, 1):
-            col = 0
-            in_string = None  # Track if we're inside a string
-            escaped = False
+    @staticmethod
+    def _source_snippet(source, line_start: int, col: int, before: int, after: int) -> str:
+        """Snippet around column ``col`` of the raw line starting at byte ``line_start``."""
+        end = _BYTES_LINE_BREAK_RE.search(source, line_start)
+        line = str(source[line_start:end.start() if end else len(source)], 'utf-8', 'ignore')
+        return line[max(0, col-before):col+after].strip()
+
+    def _check_compiled(self, file_path: pathlib.Path, source) -> List[Finding]:
+        """Run both checks with the numba scanner over the raw bytes.
+
+        Findings are identical to those of _check_delimiters and _check_quotes;
+        only their columns and snippets are decoded.
+        """
+        file_name = sys.intern(str(file_path))
+        buf = _scan_numba.as_buffer(source)
+        findings = []
+        for kind, offset, line_num, line_start, symbol, expected in (
+                _scan_numba.scan_delimiters(buf) + _scan_numba.scan_quotes(buf)):
+            char = chr(symbol)
+            col = len(str(source[line_start:offset], 'utf-8', 'ignore'))
+            if kind == _scan_numba.UNBALANCED:
+                finding = Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="unbalanced_delimiter",
+                    symbol=char,
+                    message=f"Closing '{char}' without matching opener",
+                    severity="error",
+                    near=partial(self._source_snippet, source, line_start, col, 10, 10)
+                )
+            elif kind == _scan_numba.MISMATCHED:
+                finding = Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="mismatched_delimiter",
+                    symbol=char,
+                    message=f"Expected '{chr(expected)}' but found '{char}'",
+                    severity="error",
+                    near=partial(self._source_snippet, source, line_start, col, 10, 10)
+                )
+            elif kind == _scan_numba.UNCLOSED:
+                finding = Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="unclosed_delimiter",
+                    symbol=char,
+                    message=f"Unclosed '{char}' delimiter",
+                    severity="error"
+                )
+            elif kind == _scan_numba.UNCLOSED_QUOTE:
+                finding = Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="unclosed_quote",
+                    symbol=char,
+                    message=f"Unclosed {char} quote",
+                    severity="error",
+                    near=partial(self._source_snippet, source, line_start, col, 5, 15)
+                )
+            else:
+                marker = char * 3
+                finding = Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=1,
+                    rule="unclosed_multiline_string",
+                    symbol=marker,
+                    message=f"Unclosed {marker} multi-line string",
+                    severity="error"
+                )
+            findings.append(finding)
 
-            while col < len(line):
-                char = line[col]
+        return findings
 
-                # Handle string literals to avoid false positives
-                if in_string:
-                    if escaped:
-                        escaped = False
-                    elif char == '\\':
-                        escaped = True
-                    elif char == in_string:
-                        in_string = None
-                elif char in ('"', "'"):
-                    in_string = char
-                elif char in self.OPEN:
-                    stack.append((char, line_num, col + 1))
-                elif char in self.CLOSE:
-                    if not stack:
-                        findings.append(Finding(
-                            file=str(file_path),
-                            line=line_num,
-                            col=col + 1,
-                            rule="unbalanced_delimiter",
-                            symbol=char,
-                            message=f"Closing '{char}' without matching opener",
-                            severity="error",
-                            near=line[max(0, col-10):col+10].strip()
-                        ))
-                    else:
-                        expected_close = self.PAIRS.get(stack[-1][0])
-                        if expected_close != char:
-                            findings.append(Finding(
-                                file=str(file_path),
-                                line=line_num,
-                                col=col + 1,
-                                rule="mismatched_delimiter",
-                                symbol=char,
-                                message=f"Expected '{expected_close}' but found '{char}'",
-                                severity="error",
-                                near=line[max(0, col-10):col+10].strip()
-                            ))
-                        stack.pop()
-
-                col += 1
+    def _check_delimiters(self, file_path: pathlib.Path, content: str,
+                          lines: Optional[_LineIndex] = None) -> List[Finding]:
+        """Check delimiter balance using stack-based approach."""
+        # One interned path string is shared by every finding for this file
+        file_name = sys.intern(str(file_path))
+        findings = []
+        stack = []  # Stack of (symbol, offset); offsets are located only when reported
+        if lines is None:
+            lines = _LineIndex(content)
+
+        # String literals are matched (and skipped) whole, so only delimiters
+        # outside strings reach the stack machine
+        for match in _DELIMITER_TOKEN_RE.finditer(content):
+            char = match.group()
+            if char in _CLOSE_FOR:
+                stack.append((char, match.start()))
+                continue
+            if char not in _CLOSERS:
+                continue
+
+            if not stack:
+                line_num, col = lines.locate(match.start())
+                findings.append(Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="unbalanced_delimiter",
+                    symbol=char,
+                    message=f"Closing '{char}' without matching opener",
+                    severity="error",
+                    near=partial(lines.snippet, match.start(), 10, 10)
+                ))
+            else:
+                expected_close = _CLOSE_FOR[stack[-1][0]]
+                if expected_close != char:
+                    line_num, col = lines.locate(match.start())
+                    findings.append(Finding(
+                        file=file_name,
+                        line=line_num,
+                        col=col + 1,
+                        rule="mismatched_delimiter",
+                        symbol=char,
+                        message=f"Expected '{expected_close}' but found '{char}'",
+                        severity="error",
+                        near=partial(lines.snippet, match.start(), 10, 10)
+                    ))
+                stack.pop()
 
         # Report unclosed delimiters
-        for symbol, line_num, col_num in stack:
+        for symbol, offset in stack:
+            line_num, col = lines.locate(offset)
             findings.append(Finding(
-                file=str(file_path),
+                file=file_name,
                 line=line_num,
-                col=col_num,
+                col=col + 1,
                 rule="unclosed_delimiter",
                 symbol=symbol,
                 message=f"Unclosed '{symbol}' delimiter",
@@ -126,78 +430,56 @@ class FallbackDelimiterChecker(DelimiterChecker):
 
         return findings
 
-    def _check_quotes(self, file_path: pathlib.Path, content: str) -> List[Finding]:
+    def _check_quotes(self, file_path: pathlib.Path, content: str,
+                      lines: Optional[_LineIndex] = None) -> List[Finding]:
         """Check quote balance and handle multi-line strings."""
+        file_name = sys.intern(str(file_path))
         findings = []
-        lines = content.splitlines()
+        if lines is None:
+            lines = _LineIndex(content)
 
         # Track state across lines for multi-line strings
         in_multiline_string = None
         multiline_start_line = 0
 
-        for line_num, line in enumerate(lines, 1):
-            col = 0
-            while col < len(line):
-                char = line[col]
-
-                # Handle potential multi-line string markers (like triple quotes)
-                if col + 2 < len(line) and line[col:col+3] in ('"""', "'''"):
-                    triple_quote = line[col:col+3]
-                    if in_multiline_string == triple_quote:
-                        # End of multi-line string
-                        in_multiline_string = None
-                        col += 3
-                        continue
-                    elif not in_multiline_string:
-                        # Start of multi-line string
-                        in_multiline_string = triple_quote
-                        multiline_start_line = line_num
-                        col += 3
-                        continue
-
-                # Skip if we're inside a multi-line string
-                if in_multiline_string:
-                    col += 1
-                    continue
-
-                # Check for unmatched single quotes in this line
-                if char in ('"', "'"):
-                    quote_type = char
-                    start_col = col
-                    col += 1
-                    escaped = False
-                    found_end = False
-
-                    while col < len(line):
-                        if escaped:
-                            escaped = False
-                        elif line[col] == '\\':
-                            escaped = True
-                        elif line[col] == quote_type:
-                            found_end = True
-                            break
-                        col += 1
-
-                    if not found_end:
-                        findings.append(Finding(
-                            file=str(file_path),
-                            line=line_num,
-                            col=start_col + 1,
-                            rule="unclosed_quote",
-                            symbol=quote_type,
-                            message=f"Unclosed {quote_type} quote",
-                            severity="error",
-                            near=line[max(0, start_col-5):start_col+15].strip()
-                        ))
-                    else:
-                        col += 1  # Move past the closing quote
-                else:
-                    col += 1
+        pos = 0
+        while True:
+            # Inside a multi-line string only its closing marker matters
+            if in_multiline_string:
+                end = content.find(in_multiline_string, pos)
+                if end < 0:
+                    break
+                in_multiline_string = None
+                pos = end + 3
+                continue
+
+            match = _QUOTE_TOKEN_RE.search(content, pos)
+            if match is None:
+                break
+            pos = match.end()
+
+            token = match.group()
+            if token in ('"""', "'''"):
+                in_multiline_string = token
+                multiline_start_line, _ = lines.locate(match.start())
+            elif match.lastindex is None:
+                # No closing quote before the end of the line
+                line_num, col = lines.locate(match.start())
+                findings.append(Finding(
+                    file=file_name,
+                    line=line_num,
+                    col=col + 1,
+                    rule="unclosed_quote",
+                    symbol=token[0],
+                    message=f"Unclosed {token[0]} quote",
+                    severity="error",
+                    near=partial(lines.snippet, match.start(), 5, 15)
+                ))
 
         # Report unclosed multi-line strings
         if in_multiline_string:
             findings.append(Finding(
-                file=str(file_path),
+                file=file_name,
                 line=multiline_start_line,
                 col=1,
                 rule="unclosed_multiline_string",
@@ -209,6 +491,216 @@ class FallbackDelimiterChecker(DelimiterChecker):
         return findings
 
 
+class HyperscanDelimiterChecker(FallbackDelimiterChecker):
+    """Fallback checker whose byte scan runs in a Hyperscan database.
+
+    Hyperscan reports every delimiter, quote, backslash and line break in one
+    pass; the stack machines then walk those events instead of the text.
+    Findings are identical to FallbackDelimiterChecker's.
+    """
+
+    # Event kinds, used as the Hyperscan pattern ids
+    DELIMITER, QUOTE, BACKSLASH, LINE_BREAK = range(4)
+    PATTERNS = (
+        rb'[()\[\]{}]',
+        rb'["\']',
+        rb'\\',
+        # Every break str.splitlines() honours, UTF-8 encoded
+        rb'[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]',
+    )
+
+    def __init__(self):
+        if not HYPERSCAN_AVAILABLE:
+            raise RuntimeError("hyperscan not available")
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=list(self.PATTERNS),
+            ids=list(range(len(self.PATTERNS))),
+            elements=len(self.PATTERNS),
+            flags=[0] * len(self.PATTERNS),
+        )
+        # Both checks run over the same content, so its events are kept
+        self._scanned: Optional[Tuple[str, bytes, List[Tuple[int, int]]]] = None
+
+    def _scan(self, content: str) -> Tuple[bytes, List[Tuple[int, int]]]:
+        """Return the UTF-8 bytes of ``content`` and its (offset, kind) events."""
+        if self._scanned is not None and self._scanned[0] is content:
+            return self._scanned[1], self._scanned[2]
+
+        data = content.encode('utf-8', 'surrogatepass')
+        events: List[Tuple[int, int]] = []
+        append = events.append
+        # Match ends are exclusive; every pattern but a line break is one byte
+        self._database.scan(data, match_event_handler=lambda kind, start, end, flags, context: append((end - 1, kind)))
+        self._scanned = (content, data, events)
+        return data, events
+
+    def clear_caches(self) -> None:
+        self._scanned = None
+
+    @staticmethod
+    def _column(data: bytes, line_start: int, offset: int) -> int:
+        """0-based character column of byte ``offset`` on the line starting at ``line_start``."""
+        return len(data[line_start:offset].decode('utf-8', 'surrogatepass'))
+
+    @staticmethod
+    def _is_crlf_tail(data: bytes, offset: int, last_break: int) -> bool:
+        """Whether the break at ``offset`` is the \\n of a \\r\\n, which ends one line, not two."""
+        return offset == last_break + 1 and data[offset] == 0x0A and data[last_break] == 0x0D
+
+    def _check_delimiters(self, file_path: pathlib.Path, content: str,
+                          lines: Optional[_LineIndex] = None) -> List[Finding]:
+        """Check delimiter balance by walking the scanned events.
+
+        Lines are counted from the line break events, so ``lines`` is unused.
+        """
+        file_name = sys.intern(str(file_path))
+        data, events = self._scan(content)
+        found = []  # (rule, symbol, byte offset, line, line start, message)
+        stack = []  # Stack of (opener byte, byte offset, line, line start)
+        in_string = None
+        skip = -1  # byte consumed by a backslash escape
+        line_num, line_start, last_break = 1, 0, -2
+
+        for offset, kind in events:
+            if kind == self.LINE_BREAK:
+                in_string = None  # string state resets per line
+                if not self._is_crlf_tail(data, offset, last_break):
+                    line_num += 1
+                line_start = offset + 1
+                last_break = offset
+                continue
+            if offset == skip:
+                continue
+            char = data[offset]
+            if in_string:
+                if kind == self.BACKSLASH:
+                    skip = offset + 1
+                elif char == in_string:
+                    in_string = None
+            elif kind == self.QUOTE:
+                in_string = char
+            elif kind == self.DELIMITER:
+                if char in _EXPECTED:
+                    stack.append((char, offset, line_num, line_start))
+                elif not stack:
+                    found.append(("unbalanced_delimiter", chr(char), offset, line_num, line_start,
+                                  f"Closing '{chr(char)}' without matching opener"))
+                else:
+                    expected_close = _EXPECTED[stack.pop()[0]]
+                    if expected_close != char:
+                        found.append(("mismatched_delimiter", chr(char), offset, line_num, line_start,
+                                      f"Expected '{chr(expected_close)}' but found '{chr(char)}'"))
+
+        findings = []
+        for rule, symbol, offset, line, start, message in found:
+            col = self._column(data, start, offset)
+            findings.append(Finding(
+                file=file_name,
+                line=line,
+                col=col + 1,
+                rule=rule,
+                symbol=symbol,
+                message=message,
+                severity="error",
+                near=partial(self._source_snippet, data, start, col, 10, 10)
+            ))
+
+        # Report unclosed delimiters
+        for opener, offset, line, start in stack:
+            symbol = chr(opener)
+            findings.append(Finding(
+                file=file_name,
+                line=line,
+                col=self._column(data, start, offset) + 1,
+                rule="unclosed_delimiter",
+                symbol=symbol,
+                message=f"Unclosed '{symbol}' delimiter",
+                severity="error"
+            ))
+
+        return findings
+
+    def _check_quotes(self, file_path: pathlib.Path, content: str,
+                      lines: Optional[_LineIndex] = None) -> List[Finding]:
+        """Check quote balance and multi-line strings by walking the scanned events.
+
+        Lines are counted from the line break events, so ``lines`` is unused.
+        """
+        file_name = sys.intern(str(file_path))
+        data, events = self._scan(content)
+        unclosed = []  # (byte offset, line, line start) of single-line strings left open
+        in_string = None  # (quote byte, opening offset, line, line start)
+        in_multiline_string = None
+        multiline_start_line = 0
+        skip_until = 0  # bytes consumed by an escape or a triple quote
+        line_num, line_start, last_break = 1, 0, -2
+
+        for offset, kind in events:
+            if kind == self.LINE_BREAK:
+                if in_string:
+                    unclosed.append(in_string[1:])
+                    in_string = None
+                if not self._is_crlf_tail(data, offset, last_break):
+                    line_num += 1
+                line_start = offset + 1
+                last_break = offset
+                continue
+            if offset < skip_until or kind == self.DELIMITER:
+                continue
+
+            char = data[offset]
+            if in_multiline_string:
+                # Only the closing marker matters; escapes aren't honoured
+                if kind == self.QUOTE and data.startswith(in_multiline_string, offset):
+                    in_multiline_string = None
+                    skip_until = offset + 3
+            elif in_string:
+                if kind == self.BACKSLASH:
+                    skip_until = offset + 2
+                elif char == in_string[0]:
+                    in_string = None
+            elif kind == self.QUOTE:
+                if data.startswith(bytes((char,)) * 3, offset):
+                    in_multiline_string = bytes((char,)) * 3
+                    multiline_start_line = line_num
+                    skip_until = offset + 3
+                else:
+                    in_string = (char, offset, line_num, line_start)
+        if in_string:
+            unclosed.append(in_string[1:])
+
+        findings = []
+        for offset, line, start in unclosed:
+            col = self._column(data, start, offset)
+            symbol = chr(data[offset])
+            findings.append(Finding(
+                file=file_name,
+                line=line,
+                col=col + 1,
+                rule="unclosed_quote",
+                symbol=symbol,
+                message=f"Unclosed {symbol} quote",
+                severity="error",
+                near=partial(self._source_snippet, data, start, col, 5, 15)
+            ))
+
+        # Report unclosed multi-line strings
+        if in_multiline_string:
+            marker = in_multiline_string.decode('ascii')
+            findings.append(Finding(
+                file=file_name,
+                line=multiline_start_line,
+                col=1,
+                rule="unclosed_multiline_string",
+                symbol=marker,
+                message=f"Unclosed {marker} multi-line string",
+                severity="error"
+            ))
+
+        return findings
+
+
 class TreeSitterDelimiterChecker(DelimiterChecker):
     """Tree-sitter based delimiter checker (when available)."""
 
@@ -245,10 +737,16 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
         "cmakelists.txt": "cmake",
     }
 
+    # Grammars whose incremental reparse doesn't reproduce a cold parse's
+    # error recovery (bash's external scanner), so edits are parsed from scratch
+    _COLD_PARSE_LANGUAGES: Set[str] = {"bash"}
+
+    _ERROR_QUERY = "(ERROR) @error (MISSING) @missing"
+
     _CLOSING_DELIMS: Set[str] = {"}", ")", "]"}
     _OPENING_DELIMS: Set[str] = {"{", "(", "["}
 
-    def __init__(self):
+    def __init__(self, prewarm: bool = False):
         if not TREE_SITTER_AVAILABLE:
             raise RuntimeError("Tree-sitter not available")
 
@@ -257,10 +755,28 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
         except ImportError as exc:  # pragma: no cover
             raise RuntimeError("tree_sitter_languages package not available") from exc
 
+        import tree_sitter_languages  # type: ignore
+
         self._get_language = get_language
         self._get_parser = get_parser
-        self._parser_cache: Dict[str, Parser] = {}
+        # Parsers aren't safe to share between threads, so each thread keeps its own
+        self._local = threading.local()
+        # Compiled error queries, shared by all threads; None means walk the tree instead
+        self._query_cache: Dict[str, Optional[object]] = {}
+        self._tree_cache: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+        # Outlives clear_caches(): path -> (contents, content key, tree)
+        self._edit_cache: "OrderedDict[pathlib.Path, Tuple[bytes, Tuple[str, str], object]]" = OrderedDict()
         self._fallback = FallbackDelimiterChecker()
+        self._parse_cache = ParseCache(
+            PARSE_CACHE_DIR, getattr(tree_sitter_languages, "__version__", "unknown")
+        )
+
+        if prewarm:
+            # Build every parser up front (e.g. in a worker initializer) rather
+            # than on the first file of each language
+            languages = set(self.LANGUAGE_BY_EXTENSION.values()) | set(self.LANGUAGE_BY_FILENAME.values())
+            for language in sorted(languages):
+                self._get_parser_for_language(language)
 
     def _language_for_path(self, file_path: pathlib.Path) -> Optional[str]:
         """Return tree-sitter language key for a path, if supported."""
@@ -272,9 +788,12 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
         return self.LANGUAGE_BY_EXTENSION.get(suffix)
 
     def _get_parser_for_language(self, language: str) -> Optional[Parser]:
-        """Return cached parser for the language, if available."""
-        if language in self._parser_cache:
-            return self._parser_cache[language]
+        """Return this thread's cached parser for the language, if available."""
+        cache: Optional[Dict[str, Optional[Parser]]] = getattr(self._local, "parsers", None)
+        if cache is None:
+            cache = self._local.parsers = {}
+        if language in cache:
+            return cache[language]
 
         parser: Optional[Parser] = None
 
@@ -288,17 +807,29 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             try:
                 language_obj = self._get_language(language)
             except Exception:
-                return None
+                language_obj = None
 
-            parser = Parser()
-            parser.set_language(language_obj)
+            if language_obj is not None:
+                parser = Parser()
+                parser.set_language(language_obj)
 
-        self._parser_cache[language] = parser
+        # Unavailable grammars are remembered too, so they're only tried once
+        cache[language] = parser
+        if parser is not None and language not in self._query_cache:
+            self._query_cache[language] = self._compile_error_query(language)
         return parser
 
+    def _compile_error_query(self, language: str):
+        """Compile the ERROR/MISSING query for a language, or None if unsupported."""
+        try:
+            return self._get_language(language).query(self._ERROR_QUERY)
+        except Exception:
+            # Older tree-sitter releases reject (MISSING) patterns
+            return None
+
     @staticmethod
-    def _decode_bytes(data: bytes) -> str:
-        return data.decode("utf-8", errors="replace")
+    def _decode_bytes(data) -> str:
+        return str(data, "utf-8", "replace")
 
     def _node_snippet(self, raw_bytes: bytes, lines: List[str], start_byte: int, end_byte: int, line_index: int) -> str:
         """Return a short snippet of source code around a node."""
@@ -315,7 +846,7 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             snippet = snippet[:117] + "..."
         return snippet
 
-    def _finding_from_missing(self, file_path: pathlib.Path, node, raw_bytes: bytes, lines: List[str]) -> Finding:
+    def _finding_from_missing(self, file_name: str, node, raw_bytes: bytes, lines: List[str]) -> Finding:
         line, col = node.start_point
         symbol = node.type
         line_text = self._node_snippet(raw_bytes, lines, node.start_byte, node.end_byte, line)
@@ -331,7 +862,7 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             rule = "missing_syntax"
 
         return Finding(
-            file=str(file_path),
+            file=file_name,
             line=line + 1,
             col=col + 1,
             rule=rule,
@@ -341,7 +872,7 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             near=line_text
         )
 
-    def _finding_from_error(self, file_path: pathlib.Path, node, raw_bytes: bytes, lines: List[str]) -> Finding:
+    def _finding_from_error(self, file_name: str, node, raw_bytes: bytes, lines: List[str]) -> Finding:
         line, col = node.start_point
         snippet = self._node_snippet(raw_bytes, lines, node.start_byte, node.end_byte, line)
 
@@ -350,7 +881,7 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             message += f" near '{snippet}'"
 
         return Finding(
-            file=str(file_path),
+            file=file_name,
             line=line + 1,
             col=col + 1,
             rule="tree_sitter_error",
@@ -360,30 +891,53 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             near=snippet
         )
 
-    def _collect_findings(self, file_path: pathlib.Path, tree, raw_bytes: bytes, lines: List[str]) -> List[Finding]:
+    def _collect_findings(self, file_path: pathlib.Path, tree, raw_bytes: bytes, lines: List[str],
+                          query=None) -> List[Finding]:
+        file_name = sys.intern(str(file_path))
         findings: List[Finding] = []
-        seen: Set[Tuple[int, int, str]] = set()
-        stack = [tree.root_node]
+        seen: Set[Tuple[int, int]] = set()  # (start byte, kind id): cheap integer keys
+
+        if query is not None:
+            # The query finds ERROR and MISSING nodes in C, in document order
+            captures = query.captures(tree.root_node)
+            if isinstance(captures, dict):  # newer bindings group nodes by capture name
+                captures = [(node, name) for name, nodes in captures.items() for node in nodes]
+            for node, _ in captures:
+                key = (node.start_byte, node.kind_id)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if node.is_missing:
+                    findings.append(self._finding_from_missing(file_name, node, raw_bytes, lines))
+                else:
+                    findings.append(self._finding_from_error(file_name, node, raw_bytes, lines))
+            return findings
 
-        while stack:
-            node = stack.pop()
+        # Walk with a cursor rather than materialising each node's children.
+        # Children are visited last-first, matching the stack-based walk this
+        # replaced, and subtrees without errors are skipped entirely.
+        cursor = tree.walk()
+        while True:
+            node = cursor.node
 
             if node.is_missing:
-                key = (node.start_point[0], node.start_point[1], node.type)
+                key = (node.start_byte, node.kind_id)
                 if key not in seen:
-                    findings.append(self._finding_from_missing(file_path, node, raw_bytes, lines))
+                    findings.append(self._finding_from_missing(file_name, node, raw_bytes, lines))
                     seen.add(key)
 
             elif node.type == "ERROR":
-                key = (node.start_point[0], node.start_point[1], node.type)
+                key = (node.start_byte, node.kind_id)
                 if key not in seen:
-                    findings.append(self._finding_from_error(file_path, node, raw_bytes, lines))
+                    findings.append(self._finding_from_error(file_name, node, raw_bytes, lines))
                     seen.add(key)
 
-            # Traverse children regardless so we collect nested errors/missing nodes
-            stack.extend(list(getattr(node, "children", [])))
-
-        return findings
+            # Descend regardless of the node's own kind so nested errors/missing nodes are collected
+            if node.has_error and cursor.goto_last_child():
+                continue
+            while not cursor.goto_previous_sibling():
+                if not cursor.goto_parent():
+                    return findings
 
     def check_file(self, file_path: pathlib.Path) -> List[Finding]:
         """Check file using tree-sitter parser."""
@@ -396,7 +950,7 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
             return self._fallback.check_file(file_path)
 
         try:
-            raw_bytes = file_path.read_bytes()
+            raw_bytes = _read_source(file_path)
         except Exception:
             return [Finding(
                 file=str(file_path),
@@ -408,19 +962,72 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
                 severity="error"
             )]
 
-        text = self._decode_bytes(raw_bytes)
-        lines = text.splitlines()
+        digest = hashlib.sha256(raw_bytes).hexdigest()
+        findings = self._parse_cache.get(digest, language_key, file_path)
+        if findings is None:
+            findings = self._check_bytes(file_path, parser, raw_bytes, (language_key, digest))
+            self._parse_cache.put(digest, language_key, findings)
+        return findings
 
+    def clear_caches(self) -> None:
+        self._tree_cache.clear()
+
+    def _parse(self, parser: Parser, file_path: pathlib.Path, raw_bytes: bytes, key: Tuple[str, str]):
+        """Parse ``raw_bytes``, reusing earlier trees where possible.
+
+        Identical content parsed earlier is reused as is; otherwise the path's
+        previous tree, if any, is edited and reparsed incrementally.
+        """
+        incremental = key[0] not in self._COLD_PARSE_LANGUAGES
+        if incremental and not isinstance(raw_bytes, bytes):
+            # The edit cache needs a snapshot: a mapped file can change under us
+            raw_bytes = bytes(raw_bytes)
+        tree = self._tree_cache.get(key)
+        if tree is not None:
+            self._tree_cache.move_to_end(key)
+        else:
+            previous = self._edit_cache.pop(file_path, None) if incremental else None
+            if previous is not None and previous[1][0] == key[0]:
+                old_bytes, old_key, old_tree = previous
+                self._release_tree(old_key, old_tree)
+                old_tree.edit(**_input_edit(old_bytes, raw_bytes))
+                tree = parser.parse(raw_bytes, old_tree)
+            else:
+                tree = parser.parse(raw_bytes)
+            self._tree_cache[key] = tree
+            if len(self._tree_cache) > TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+
+        if incremental:
+            self._edit_cache[file_path] = (raw_bytes, key, tree)
+            self._edit_cache.move_to_end(file_path)
+            if len(self._edit_cache) > EDIT_CACHE_SIZE:
+                self._edit_cache.popitem(last=False)
+        return tree
+
+    def _release_tree(self, key: Tuple[str, str], tree) -> None:
+        """Drop every other reference to a tree that is about to be edited in place."""
+        if self._tree_cache.get(key) is tree:
+            del self._tree_cache[key]
+        for path in [path for path, entry in self._edit_cache.items() if entry[2] is tree]:
+            del self._edit_cache[path]
+
+    def _check_bytes(self, file_path: pathlib.Path, parser: Parser, raw_bytes: bytes,
+                     key: Tuple[str, str]) -> List[Finding]:
+        """Parse file contents and collect findings, falling back to manual checks."""
         try:
-            tree = parser.parse(raw_bytes)
+            tree = self._parse(parser, file_path, raw_bytes, key)
         except Exception:
             # If parsing fails unexpectedly, fall back to manual checks
             return self._fallback.check_file(file_path)
 
+        # A clean root means no ERROR/missing node anywhere, so valid files
+        # never pay for decoding the text used in snippets
         if not tree.root_node.has_error:
             return []
 
-        findings = self._collect_findings(file_path, tree, raw_bytes, lines)
+        lines = self._decode_bytes(raw_bytes).splitlines()
+        findings = self._collect_findings(file_path, tree, raw_bytes, lines, self._query_cache.get(key[0]))
 
         # Tree-sitter occasionally marks has_error without explicit ERROR nodes; ensure fallback covers
         if not findings:
@@ -429,11 +1036,20 @@ class TreeSitterDelimiterChecker(DelimiterChecker):
         return findings
 
 
-def get_delimiter_checker() -> DelimiterChecker:
-    """Get the best available delimiter checker."""
+def get_delimiter_checker(prewarm: bool = False) -> DelimiterChecker:
+    """Get the best available delimiter checker.
+
+    With ``prewarm``, a tree-sitter checker builds all of its parsers immediately.
+    """
     if TREE_SITTER_AVAILABLE:
         try:
-            return TreeSitterDelimiterChecker()
+            return TreeSitterDelimiterChecker(prewarm=prewarm)
+        except Exception:
+            pass
+
+    if HYPERSCAN_AVAILABLE:
+        try:
+            return HyperscanDelimiterChecker()
         except Exception:
             pass
 
@@ -442,6 +1058,10 @@ def get_delimiter_checker() -> DelimiterChecker:
 
 def check_markdown_fences(file_path: pathlib.Path, content: str) -> List[Finding]:
     """Check for balanced markdown code fences."""
+    if '```' not in content:
+        return []
+
+    file_name = sys.intern(str(file_path))
     findings = []
     lines = content.splitlines()
     fence_stack = []  # Stack of (fence_type, line_num, language)
@@ -463,7 +1083,7 @@ def check_markdown_fences(file_path: pathlib.Path, content: str) -> List[Finding
     for fence_type, line_num, language in fence_stack:
         lang_info = f" (lang={language})" if language else ""
         findings.append(Finding(
-            file=str(file_path),
+            file=file_name,
             line=line_num,
             col=1,
             rule="unclosed_code_fence",
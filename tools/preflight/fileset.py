@@ -4,79 +4,202 @@ File discovery module for llmtk preflight
 Handles file discovery based on --diff, --since, and --paths options.
 """
 
+import os
 import pathlib
+import stat
 import subprocess
 import sys
-from typing import List, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Optional
 
+# Fallback when there are no git changes: whole source trees, plus sources at the top level
+COMMON_SOURCE_DIRS = ('src', 'include')
+COMMON_SOURCE_SUFFIXES = ('.cpp', '.h', '.hpp', '.c')
 
-def run_git_command(cmd: List[str], cwd: Optional[pathlib.Path] = None) -> List[str]:
-    """Run a git command and return output lines, or empty list on failure."""
+
+# Porcelain status codes for deleted files, and for renames/copies whose
+# record is followed by the source path
+_STATUS_SKIP = frozenset('D')
+_STATUS_WITH_SOURCE = frozenset('RC')
+
+
+def _git_output(cmd: List[str], cwd: Optional[pathlib.Path] = None) -> Optional[bytes]:
+    """Run a git command and return its raw stdout, or None on failure."""
     try:
-        result = subprocess.run(
+        return subprocess.run(
             cmd,
             cwd=cwd or pathlib.Path.cwd(),
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=True
-        )
-        return [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
+        ).stdout
     except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def _decode_path(raw: bytes) -> str:
+    # Same convention Python uses for undecodable file names
+    return raw.decode('utf-8', 'surrogateescape')
+
+
+def run_git_command_z(cmd: List[str], cwd: Optional[pathlib.Path] = None) -> List[str]:
+    """Run a git command with ``-z`` output and return its NUL-separated fields.
+
+    Paths come back verbatim (no quoting, no stripping), so names with
+    spaces or non-ASCII characters survive.
+    """
+    output = _git_output(cmd, cwd)
+    if not output:
         return []
+    return [_decode_path(field) for field in output.split(b'\0') if field]
 
 
 def get_git_diff_files(base_ref: str, target_ref: Optional[str] = None, cwd: Optional[pathlib.Path] = None) -> List[str]:
     """Get list of files that differ between git references."""
     if target_ref:
-        cmd = ["git", "diff", "--name-only", f"{base_ref}...{target_ref}"]
+        cmd = ["git", "diff", "--name-only", "-z", f"{base_ref}...{target_ref}"]
     else:
-        cmd = ["git", "diff", "--name-only", base_ref]
-    return run_git_command(cmd, cwd)
+        cmd = ["git", "diff", "--name-only", "-z", base_ref]
+    return run_git_command_z(cmd, cwd)
 
 
 def get_git_changed_files_since(since_ref: str, cwd: Optional[pathlib.Path] = None) -> List[str]:
     """Get list of files changed since a reference."""
-    cmd = ["git", "diff", "--name-only", f"{since_ref}..HEAD"]
-    return run_git_command(cmd, cwd)
+    cmd = ["git", "diff", "--name-only", "-z", f"{since_ref}..HEAD"]
+    return run_git_command_z(cmd, cwd)
 
 
 def get_git_status_files(cwd: Optional[pathlib.Path] = None) -> List[str]:
     """Get list of modified files in working directory."""
-    cmd = ["git", "status", "--porcelain=v1"]
-    lines = run_git_command(cmd, cwd)
+    cmd = ["git", "status", "--porcelain=v1", "-z"]
+    output = _git_output(cmd, cwd)
+    if not output:
+        return []
+
+    # One decode for the whole output is cheaper than one per record
+    records = iter(_decode_path(output).split('\0'))
     files = []
-    for line in lines:
-        if len(line) >= 3:
-            # Format: XY filename
-            # Skip deleted files (D), focus on modified/added/renamed
-            status = line[:2]
-            if 'D' not in status:
-                files.append(line[3:])
+    for record in records:
+        # Format: XY filename
+        if len(record) < 4:
+            continue
+        index, worktree = record[0], record[1]
+        if index in _STATUS_WITH_SOURCE or worktree in _STATUS_WITH_SOURCE:
+            next(records, None)  # renames and copies are followed by their source path
+        # Skip deleted files (D), focus on modified/added/renamed
+        if index in _STATUS_SKIP or worktree in _STATUS_SKIP:
+            continue
+        files.append(record[3:])
     return files
 
 
-def filter_existing_files(files: List[str], cwd: Optional[pathlib.Path] = None) -> List[pathlib.Path]:
-    """Filter to only existing files and return as Path objects."""
-    base_path = cwd or pathlib.Path.cwd()
-    existing = []
-    for file_str in files:
-        file_path = base_path / file_str
-        if file_path.exists() and file_path.is_file():
-            existing.append(file_path)
-    return existing
+def get_git_fileset(
+    diff_base: Optional[str] = None,
+    diff_target: Optional[str] = None,
+    since_ref: Optional[str] = None,
+    include_working_changes: bool = True,
+    cwd: Optional[pathlib.Path] = None
+) -> List[str]:
+    """Collect changed files from git, running the diff and status queries concurrently.
 
+    A diff from ``diff_base`` takes precedence over ``since_ref``; working
+    directory changes are added when requested.
+    """
+    queries = []
+    if diff_base:
+        queries.append(partial(get_git_diff_files, diff_base, diff_target, cwd))
+    elif since_ref:
+        queries.append(partial(get_git_changed_files_since, since_ref, cwd))
+    if include_working_changes:
+        queries.append(partial(get_git_status_files, cwd))
 
-def filter_by_extensions(files: List[pathlib.Path], extensions: Set[str]) -> List[pathlib.Path]:
-    """Filter files by file extensions."""
-    if not extensions:
-        return files
+    # Ordered de-duplication, so runs over the same changes list files alike
+    files: Dict[str, None] = {}
+    if len(queries) < 2:
+        for query in queries:
+            files.update(dict.fromkeys(query()))
+        return list(files)
 
-    filtered = []
-    for file_path in files:
-        suffix = file_path.suffix.lower()
-        if suffix in extensions:
-            filtered.append(file_path)
-    return filtered
+    # Each query mostly waits on its git process, so threads are enough
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        for result in executor.map(lambda query: query(), queries):
+            files.update(dict.fromkeys(result))
+    return list(files)
+
+
+def _scandir_recursive(root: str) -> Iterator[os.DirEntry]:
+    """Yield the files below ``root``, reusing the type information scandir already has.
+
+    Like ``Path.rglob('*')``, symlinked directories aren't descended into;
+    unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_recursive(entry.path)
+            elif entry.is_file():
+                yield entry
+        except OSError:
+            continue
+
+
+def _scan_common_sources(cwd: pathlib.Path) -> List[str]:
+    """List the files under the common source directories, then top-level C/C++ sources.
+
+    Each directory is listed once; the top level isn't recursed into.
+    """
+    found = [entry.path for source_dir in COMMON_SOURCE_DIRS
+             for entry in _scandir_recursive(source_dir)]
+    try:
+        with os.scandir(cwd) as it:
+            found.extend(entry.name for entry in it
+                         if entry.name.endswith(COMMON_SOURCE_SUFFIXES) and entry.is_file())
+    except OSError:
+        pass
+    return found
+
+
+def _resolve_and_filter(
+    files: Iterable[str],
+    base: pathlib.Path,
+    extensions: Optional[Set[str]] = None,
+    known_files: Optional[Set[str]] = None,
+    max_files: Optional[int] = None
+) -> List[pathlib.Path]:
+    """Keep the existing files with a wanted extension, as Path objects.
+
+    Extensions are checked before anything touches the disk, and paths in
+    ``known_files`` are already known to be regular files, so only the rest
+    are stat'ed. Stops once ``max_files`` have been found.
+    """
+    base_str = os.fspath(base)
+    existing: List[pathlib.Path] = []
+    seen: Set[pathlib.Path] = set()
+    for file_str in files:
+        if extensions and os.path.splitext(file_str)[1].lower() not in extensions:
+            continue
+        if not (known_files and file_str in known_files):
+            # Stat the joined string; a Path is only built for files that are kept
+            try:
+                if not stat.S_ISREG(os.stat(os.path.join(base_str, file_str)).st_mode):
+                    continue
+            except OSError:
+                continue
+        # Paths normalise on joining, so './src/a.c' and 'src/a.c' collapse here
+        file_path = base / file_str
+        if file_path in seen:
+            continue
+        existing.append(file_path)
+        seen.add(file_path)
+        if max_files and len(existing) >= max_files:
+            break
+    return existing
 
 
 def discover_files(
@@ -86,7 +209,8 @@ def discover_files(
     explicit_paths: Optional[List[str]] = None,
     include_working_changes: bool = True,
     max_files: Optional[int] = None,
-    extensions: Optional[Set[str]] = None
+    extensions: Optional[Set[str]] = None,
+    scan_all: bool = False
 ) -> List[pathlib.Path]:
     """
     Discover files to check based on the provided criteria.
@@ -99,105 +223,89 @@ def discover_files(
         include_working_changes: Include unstaged/staged changes
         max_files: Maximum number of files to return
         extensions: Set of file extensions to include (e.g., {'.cpp', '.h', '.py'})
+        scan_all: With no reference and no git changes, check common source
+            locations instead of returning nothing
 
     Returns:
         List of Path objects for files to check
     """
-    files: Set[str] = set()
+    # Candidates in discovery order; a dict de-duplicates without losing it
+    files: Dict[str, None] = {}
+    known_files: Set[str] = set()  # already seen to be regular files
     cwd = pathlib.Path.cwd()
 
     # Explicit paths take precedence
     if explicit_paths:
         for path_str in explicit_paths:
+            # One stat decides file vs directory; the filter below won't repeat it
+            try:
+                st = os.stat(path_str)
+            except OSError:
+                continue
             path = pathlib.Path(path_str)
-            if path.is_file():
-                files.add(str(path.relative_to(cwd) if path.is_absolute() else path))
-            elif path.is_dir():
-                # Add all files in directory recursively
-                for file_path in path.rglob('*'):
-                    if file_path.is_file():
-                        files.add(str(file_path.relative_to(cwd)))
-
-    # Git diff between references
-    elif diff_base:
-        git_files = get_git_diff_files(diff_base, diff_target, cwd)
-        files.update(git_files)
-
-    # Git changes since reference
-    elif since_ref:
-        git_files = get_git_changed_files_since(since_ref, cwd)
-        files.update(git_files)
-
-    # Include working directory changes if requested
-    if include_working_changes and not explicit_paths:
-        working_files = get_git_status_files(cwd)
-        files.update(working_files)
-
-    # Default: check working directory changes only
-    if not files and not explicit_paths and not diff_base and not since_ref:
-        working_files = get_git_status_files(cwd)
-        files.update(working_files)
+            relative = str(path.relative_to(cwd)) if path.is_absolute() and path.is_relative_to(cwd) else str(path)
+            if stat.S_ISREG(st.st_mode):
+                files[relative] = None
+                known_files.add(relative)
+            elif stat.S_ISDIR(st.st_mode):
+                # Add all files in directory recursively, keeping paths as
+                # strings; they're joined onto cwd when filtered below
+                walked = [entry.path for entry in _scandir_recursive(relative)]
+                files.update(dict.fromkeys(walked))
+                known_files.update(walked)
+    else:
+        # Without a reference, preflight checks the working directory changes
+        working = include_working_changes or not (diff_base or since_ref)
+        files.update(dict.fromkeys(get_git_fileset(diff_base, diff_target, since_ref, working, cwd)))
 
-        # If no git changes, fallback to common source patterns
-        if not working_files:
-            common_patterns = ['src/**/*', 'include/**/*', '*.cpp', '*.h', '*.hpp', '*.c']
-            for pattern in common_patterns:
-                for path in cwd.glob(pattern):
-                    if path.is_file():
-                        files.add(str(path.relative_to(cwd)))
+    # A clean tree normally means nothing to check; scanning common source
+    # locations instead is opt-in
+    if scan_all and not files and not explicit_paths and not diff_base and not since_ref:
+        walked = _scan_common_sources(cwd)
+        files.update(dict.fromkeys(walked))
+        known_files.update(walked)
 
-    # Filter to existing files and convert to Path objects
-    existing_files = filter_existing_files(list(files), cwd)
+    # Filter by extension and existence in one pass, up to the max files limit
+    return _resolve_and_filter(files, cwd, extensions, known_files, max_files)
 
-    # Filter by extensions if specified
-    if extensions:
-        existing_files = filter_by_extensions(existing_files, extensions)
 
-    # Apply max files limit
-    if max_files and len(existing_files) > max_files:
-        existing_files = existing_files[:max_files]
+# File extensions supported by preflight checkers
+_SUPPORTED_EXTS: FrozenSet[str] = frozenset({
+    # C/C++
+    '.c', '.cpp', '.cxx', '.cc', '.C', '.c++',
+    '.h', '.hpp', '.hxx', '.hh', '.H', '.h++',
 
-    return existing_files
+    # CMake
+    '.cmake', '.txt',  # CMakeLists.txt will be caught by name
 
+    # Data formats
+    '.json', '.yaml', '.yml', '.toml',
 
-def get_supported_extensions() -> Set[str]:
-    """Return set of file extensions supported by preflight checkers."""
-    return {
-        # C/C++
-        '.c', '.cpp', '.cxx', '.cc', '.C', '.c++',
-        '.h', '.hpp', '.hxx', '.hh', '.H', '.h++',
+    # Documentation
+    '.md', '.rst',
 
-        # CMake
-        '.cmake', '.txt',  # CMakeLists.txt will be caught by name
+    # Scripts
+    '.sh', '.bash', '.py',
 
-        # Data formats
-        '.json', '.yaml', '.yml', '.toml',
+    # Config files
+    '.ini', '.cfg', '.conf'
+})
 
-        # Documentation
-        '.md', '.rst',
+# File names checked whatever their extension (compared lowercased)
+_NAME_PATTERNS: FrozenSet[str] = frozenset({
+    'cmakelists.txt',
+    'makefile',
+    'dockerfile',
+    '.clang-tidy',
+    '.clang-format'
+})
 
-        # Scripts
-        '.sh', '.bash', '.py',
 
-        # Config files
-        '.ini', '.cfg', '.conf'
-    }
+def get_supported_extensions() -> FrozenSet[str]:
+    """Return set of file extensions supported by preflight checkers."""
+    return _SUPPORTED_EXTS
 
 
 def should_check_file(file_path: pathlib.Path) -> bool:
     """Determine if a file should be checked by preflight."""
-    # Check by extension
-    if file_path.suffix.lower() in get_supported_extensions():
-        return True
-
-    # Check by name patterns
-    name = file_path.name.lower()
-    name_patterns = {
-        'cmakelists.txt',
-        'makefile',
-        'dockerfile',
-        '.clang-tidy',
-        '.clang-format'
-    }
-
-    return name in name_patterns
\ No newline at end of file
+    return file_path.suffix.lower() in _SUPPORTED_EXTS or file_path.name.lower() in _NAME_PATTERNS
@@ -5,9 +5,13 @@ Coordinates file discovery, delimiter checking, and syntax probing.
 """
 
 import argparse
+import multiprocessing
+import os
 import pathlib
 import sys
-from typing import List, Optional, Set, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Set, Dict, Any
 from dataclasses import dataclass
 
 from .fileset import discover_files, should_check_file, get_supported_extensions
@@ -31,11 +35,22 @@ class PreflightArgs:
     no_tree_sitter: bool = False
     no_syntax: bool = False
     extensions: Optional[Set[str]] = None
+    scan_all: bool = False
     verbose: bool = False
 
 
-def check_file_delimiters(file_path: pathlib.Path, delimiter_checker) -> List[Finding]:
-    """Check a single file for delimiter issues."""
+# Files that also get markdown code fence checks
+MARKDOWN_SUFFIXES = frozenset({'.md', '.rst'})
+
+
+def check_file_delimiters(file_path: pathlib.Path, delimiter_checker, suffix: Optional[str] = None) -> List[Finding]:
+    """Check a single file for delimiter issues.
+
+    ``suffix`` is the file's lowercased suffix, if the caller already has it.
+    """
+    if suffix is None:
+        suffix = file_path.suffix.lower()
+
     findings = []
 
     try:
@@ -44,7 +59,7 @@ def check_file_delimiters(file_path: pathlib.Path, delimiter_checker) -> List[Fi
         findings.extend(delimiter_findings)
 
         # Special handling for markdown files
-        if file_path.suffix.lower() in {'.md', '.rst'}:
+        if suffix in MARKDOWN_SUFFIXES:
             try:
                 content = file_path.read_text(encoding='utf-8', errors='ignore')
                 markdown_findings = check_markdown_fences(file_path, content)
@@ -66,9 +81,57 @@ def check_file_delimiters(file_path: pathlib.Path, delimiter_checker) -> List[Fi
     return findings
 
 
-def check_file_syntax(file_path: pathlib.Path, syntax_probes) -> List[Finding]:
+# Below this many files the worker start-up costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# Delimiter checker owned by each worker process (parsers can't be pickled)
+_worker_checker = None
+
+
+def _worker_context():
+    """Start method for delimiter workers that never forks this process.
+
+    Syntax probe threads are already running when the pool starts, and a
+    child forked from a multi-threaded process can deadlock on a lock one of
+    those threads held.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_delimiter_worker() -> None:
+    global _worker_checker
+    _worker_checker = get_delimiter_checker(prewarm=True)
+
+
+def _check_delimiters_in_worker(file_path: pathlib.Path, suffix: str) -> List[Finding]:
+    return check_file_delimiters(file_path, _worker_checker, suffix)
+
+
+def check_files_delimiters(files: List[pathlib.Path], delimiter_checker,
+                           suffixes: Optional[List[str]] = None) -> Dict[pathlib.Path, List[Finding]]:
+    """Check files for delimiter issues, in worker processes when there are enough of them."""
+    if suffixes is None:
+        suffixes = [file_path.suffix.lower() for file_path in files]
+    workers = min(os.cpu_count() or 1, len(files) // PARALLEL_MIN_FILES)
+    if workers < 2:
+        return {file_path: check_file_delimiters(file_path, delimiter_checker, suffix)
+                for file_path, suffix in zip(files, suffixes)}
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context(),
+                             initializer=_init_delimiter_worker) as executor:
+        results = executor.map(_check_delimiters_in_worker, files, suffixes, chunksize=16)
+        return dict(zip(files, results))
+
+
+# Syntax probes mostly wait on subprocesses, so more threads than cores pay off
+SYNTAX_MAX_WORKERS = 32
+
+
+def check_file_syntax(file_path: pathlib.Path, syntax_probes, suffix: Optional[str] = None) -> List[Finding]:
     """Check a single file for syntax issues using external probes."""
-    probe = get_probe_for_file(file_path, syntax_probes)
+    probe = get_probe_for_file(file_path, syntax_probes, suffix)
     if not probe:
         return []
 
@@ -86,20 +149,61 @@ def check_file_syntax(file_path: pathlib.Path, syntax_probes) -> List[Finding]:
         )]
 
 
+# Files are read this much at a time when counting their lines
+LINE_COUNT_CHUNK = 1 << 20
+
+
 def should_skip_file_size(file_path: pathlib.Path, max_lines: Optional[int]) -> bool:
     """Check if file should be skipped due to size limits."""
     if not max_lines:
         return False
 
     try:
-        # Quick line count check
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            line_count = sum(1 for _ in f)
+        # Every line takes at least one byte
+        if os.stat(file_path).st_size <= max_lines:
+            return False
+
+        # Count line endings as text mode sees them (\n, \r\n or a lone \r),
+        # stopping as soon as the limit is passed
+        line_count = 0
+        last_byte = 10
+        buffer = bytearray(LINE_COUNT_CHUNK)
+        with open(file_path, 'rb') as f:
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                line_count += buffer.count(b'\n', 0, size)
+                carriage_returns = buffer.count(b'\r', 0, size)
+                if carriage_returns:
+                    line_count += carriage_returns - buffer.count(b'\r\n', 0, size)
+                if last_byte == 13 and buffer[0] == 10:
+                    line_count -= 1  # a \r\n split across chunks
+                last_byte = buffer[size - 1]
+                if line_count > max_lines:
+                    return True
+
+        if last_byte not in (10, 13):
+            line_count += 1  # final line without a line ending
         return line_count > max_lines
     except Exception:
         return False
 
 
+def _iter_checkable(files: Iterable[pathlib.Path], max_lines: Optional[int]) -> Iterator[pathlib.Path]:
+    """Yield the files preflight supports, skipping those over ``max_lines``."""
+    for file_path in files:
+        if should_check_file(file_path) and not (max_lines and should_skip_file_size(file_path, max_lines)):
+            yield file_path
+
+
+def _init_checkers(args: PreflightArgs):
+    """Build the delimiter checker and syntax probes enabled by ``args``."""
+    delimiter_checker = None if args.no_tree_sitter else get_delimiter_checker()
+    syntax_probes = [] if args.no_syntax else get_syntax_probes()
+    return delimiter_checker, syntax_probes
+
+
 def run_preflight(args: PreflightArgs) -> int:
     """
     Run the preflight checks and return exit code.
@@ -115,22 +219,29 @@ def run_preflight(args: PreflightArgs) -> int:
         if args.verbose:
             print("Discovering files...", file=sys.stderr)
 
-        files = discover_files(
+        discover = partial(
+            discover_files,
             diff_base=args.diff_base,
             diff_target=args.diff_target,
             since_ref=args.since_ref,
             explicit_paths=args.paths,
             include_working_changes=True,
             max_files=args.max_files,
-            extensions=args.extensions
+            extensions=args.extensions,
+            scan_all=args.scan_all
         )
 
-        # Filter to supported files
-        supported_files = [f for f in files if should_check_file(f)]
+        if args.paths:
+            files = discover()
+        else:
+            # Discovery mostly waits on git, so set up the checkers meanwhile
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = executor.submit(discover)
+                delimiter_checker, syntax_probes = _init_checkers(args)
+                files = pending.result()
 
-        # Apply size limits
-        if args.max_lines:
-            supported_files = [f for f in supported_files if not should_skip_file_size(f, args.max_lines)]
+        # Filter to supported files within the size limits, in one pass
+        supported_files = list(_iter_checkable(files, args.max_lines))
 
         if args.verbose:
             print(f"Found {len(supported_files)} files to check", file=sys.stderr)
@@ -147,31 +258,48 @@ def run_preflight(args: PreflightArgs) -> int:
 
         all_findings: List[Finding] = []
 
-        # Initialize checkers
-        delimiter_checker = None if args.no_tree_sitter else get_delimiter_checker()
-        syntax_probes = [] if args.no_syntax else get_syntax_probes()
+        # Initialize checkers, unless that happened during discovery
+        if args.paths:
+            delimiter_checker, syntax_probes = _init_checkers(args)
 
         if args.verbose:
             print(f"Available syntax probes: {[type(p).__name__ for p in syntax_probes]}", file=sys.stderr)
 
-        # Check each file
-        for file_path in supported_files:
-            if args.verbose:
-                print(f"Checking {file_path}...", file=sys.stderr)
+        # Suffixes drive several checks, so they're derived once per file
+        suffixes = [file_path.suffix.lower() for file_path in supported_files]
 
-            file_findings: List[Finding] = []
+        # Every file is checked independently: syntax probes (mostly waiting on
+        # external tools) run on threads while delimiter checks run in parallel
+        syntax_workers = min(SYNTAX_MAX_WORKERS, (os.cpu_count() or 1) * 2, len(supported_files))
+        with ThreadPoolExecutor(max_workers=syntax_workers) as syntax_executor:
+            syntax_results = syntax_executor.map(
+                lambda file_path, suffix: check_file_syntax(file_path, syntax_probes, suffix),
+                supported_files, suffixes
+            ) if syntax_probes else None
 
-            # Delimiter checking
+            delimiter_results: Dict[pathlib.Path, List[Finding]] = {}
             if delimiter_checker:
-                delimiter_findings = check_file_delimiters(file_path, delimiter_checker)
-                file_findings.extend(delimiter_findings)
+                delimiter_results = check_files_delimiters(supported_files, delimiter_checker, suffixes)
+
+            # Merge per file, in discovery order
+            for file_path in supported_files:
+                if args.verbose:
+                    print(f"Checking {file_path}...", file=sys.stderr)
+
+                file_findings: List[Finding] = []
+
+                # Delimiter checking
+                if delimiter_checker:
+                    file_findings.extend(delimiter_results[file_path])
 
-            # Syntax checking
-            if syntax_probes:
-                syntax_findings = check_file_syntax(file_path, syntax_probes)
-                file_findings.extend(syntax_findings)
+                # Syntax checking
+                if syntax_results is not None:
+                    file_findings.extend(next(syntax_results))
 
-            all_findings.extend(file_findings)
+                all_findings.extend(file_findings)
+
+        if delimiter_checker:
+            delimiter_checker.clear_caches()
 
         # Generate outputs
         if args.json_output:
@@ -201,7 +329,10 @@ def create_argument_parser() -> argparse.ArgumentParser:
     """Create the argument parser for preflight."""
     parser = argparse.ArgumentParser(
         prog="llmtk preflight",
-        description="Fast syntax and delimiter checking before build operations"
+        description="Fast syntax and delimiter checking before build operations",
+        epilog="Without --diff, --since or --paths, only files with working tree "
+               "changes (git status) are checked; a clean tree checks nothing "
+               "unless --scan-all is given."
     )
 
     # File discovery options (mutually exclusive group)
@@ -222,6 +353,11 @@ def create_argument_parser() -> argparse.ArgumentParser:
         metavar="PATH",
         help="Explicit paths to check"
     )
+    parser.add_argument(
+        "--scan-all",
+        action="store_true",
+        help="With no git changes, check src/, include/ and top-level C/C++ sources"
+    )
 
     # Output options
     parser.add_argument(
@@ -318,6 +454,7 @@ def parse_args(argv: Optional[List[str]] = None) -> PreflightArgs:
         no_tree_sitter=args.no_tree_sitter,
         no_syntax=args.no_syntax,
         extensions=extensions,
+        scan_all=args.scan_all,
         verbose=args.verbose
     )
 
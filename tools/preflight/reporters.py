@@ -7,13 +7,16 @@ Handles JSON, SARIF, and human-readable output formats with unified reporting.
 import json
 import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional, TextIO, Set, Tuple
+from typing import Callable, Dict, List, Any, Optional, TextIO, Set, Tuple, Union
 import pathlib
 
 
 class Finding:
     """Represents a single preflight finding with enhanced metadata."""
 
+    # Bad files can produce thousands of findings; slots keep each one small
+    __slots__ = ("file", "line", "col", "rule", "symbol", "message", "severity", "_near", "source")
+
     def __init__(
         self,
         file: str,
@@ -23,7 +26,7 @@ class Finding:
         symbol: str,
         message: str,
         severity: str = "error",
-        near: str = "",
+        near: Union[str, Callable[[], str]] = "",
         source: str = "preflight"
     ):
         self.file = file
@@ -33,9 +36,26 @@ class Finding:
         self.symbol = symbol
         self.message = message
         self.severity = severity.lower()  # Normalize severity
-        self.near = near
+        self._near = near  # str, or a callable that builds it on first access
         self.source = source  # Which checker produced this finding
 
+    @property
+    def near(self) -> str:
+        """Source snippet around the finding."""
+        if callable(self._near):
+            self._near = self._near()
+        return self._near
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Resolve a deferred snippet rather than pickling the source behind it
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_near"] = self.near
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __eq__(self, other) -> bool:
         """Check equality for deduplication."""
         if not isinstance(other, Finding):
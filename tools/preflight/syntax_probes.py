@@ -817,10 +817,13 @@ def get_syntax_probes() -> List[SyntaxProbe]:
     return [probe for probe in probes if probe.available]
 
 
-def get_probe_for_file(file_path: pathlib.Path, probes: List[SyntaxProbe]) -> Optional[SyntaxProbe]:
-    """Get the appropriate syntax probe for a file."""
-    extension = file_path.suffix.lower()
-    filename = file_path.name.lower()
+def get_probe_for_file(file_path: pathlib.Path, probes: List[SyntaxProbe],
+                       suffix: Optional[str] = None) -> Optional[SyntaxProbe]:
+    """Get the appropriate syntax probe for a file.
+
+    ``suffix`` is the file's lowercased suffix, if the caller already has it.
+    """
+    extension = file_path.suffix.lower() if suffix is None else suffix
 
     for probe in probes:
         if extension in probe.get_supported_extensions():